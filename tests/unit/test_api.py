@@ -0,0 +1,274 @@
+"""
+Unit tests for the TwinGraph API server.
+"""
+
+import asyncio
+import orjson
+
+from twingraph.api import main
+from twingraph.api.models import (
+    ExecutionRequest, ExecutionStatus, NodeStatus, Workflow, WorkflowMetadata
+)
+
+
+class FakeWebSocket:
+    """Collects the messages sent to one client."""
+    
+    def __init__(self):
+        self.sent = []
+    
+    async def send_text(self, text):
+        self.sent.append(orjson.loads(text))
+
+
+async def wait_for(condition, timeout=1.0):
+    """Yield to the event loop until condition() holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def make_execution(execution_id):
+    return ExecutionStatus(
+        workflow_id='wf',
+        execution_id=execution_id,
+        status='running',
+        start_time='2025-01-01T00:00:00',
+        nodes={'n1': NodeStatus(node_id='n1', status='pending')}
+    )
+
+
+class TestMergePatch:
+    """Test RFC 7386 merge patches between execution snapshots."""
+    
+    def test_identical_documents(self):
+        """Test an unchanged document yields an empty patch."""
+        document = {'status': 'running', 'nodes': {'n1': {'status': 'pending'}}}
+        assert main.merge_patch(document, document) == {}
+    
+    def test_changed_and_added_values(self):
+        """Test changed and new keys are sent, unchanged ones are not."""
+        old = {'status': 'running', 'error': None}
+        new = {'status': 'failed', 'error': 'boom', 'end_time': 'now'}
+        assert main.merge_patch(old, new) == {
+            'status': 'failed', 'error': 'boom', 'end_time': 'now'
+        }
+    
+    def test_removed_keys_become_null(self):
+        """Test keys missing from the new document are deleted with null."""
+        assert main.merge_patch({'a': 1, 'b': 2}, {'a': 1}) == {'b': None}
+    
+    def test_nested_objects_are_diffed(self):
+        """Test only the changed leaves of nested objects are sent."""
+        old = {'nodes': {'n1': {'status': 'running', 'logs': []}, 'n2': {'status': 'pending'}}}
+        new = {'nodes': {'n1': {'status': 'completed', 'logs': []}, 'n2': {'status': 'pending'}}}
+        assert main.merge_patch(old, new) == {'nodes': {'n1': {'status': 'completed'}}}
+    
+    def test_lists_are_replaced_whole(self):
+        """Test a changed list is sent in full, as RFC 7386 requires."""
+        old = {'logs': ['a']}
+        new = {'logs': ['a', 'b']}
+        assert main.merge_patch(old, new) == {'logs': ['a', 'b']}
+    
+    def test_patches_rebuild_the_snapshot(self):
+        """Test applying the patch to the old document gives the new one."""
+        def apply(target, patch):
+            result = dict(target)
+            for key, value in patch.items():
+                if value is None:
+                    result.pop(key, None)
+                elif isinstance(value, dict) and isinstance(result.get(key), dict):
+                    result[key] = apply(result[key], value)
+                else:
+                    result[key] = value
+            return result
+        
+        old = {'status': 'running', 'error': 'x', 'nodes': {'n1': {'status': 'running'}}}
+        new = {'status': 'completed', 'nodes': {'n1': {'status': 'completed'}, 'n2': {}}}
+        assert apply(old, main.merge_patch(old, new)) == new
+
+
+class TestExecutionUpdates:
+    """Test the messages published for execution updates."""
+    
+    def test_snapshot_then_patches(self):
+        """Test the first update is a snapshot and later ones only what changed."""
+        execution_id = 'exec-updates'
+        
+        async def scenario():
+            subscription = await main.state_store.subscribe(execution_id)
+            try:
+                execution = make_execution(execution_id)
+                await main.notify_execution_update(execution_id, execution)
+                # Nothing changed, so nothing is published
+                await main.notify_execution_update(execution_id, execution)
+                execution.nodes['n1'].status = 'completed'
+                execution.status = 'completed'
+                await main.notify_execution_update(execution_id, execution)
+                return [orjson.loads(await subscription.__anext__()) for _ in range(2)]
+            finally:
+                await subscription.close()
+        
+        snapshot, patch = asyncio.run(scenario())
+        
+        assert snapshot['type'] == f'execution:{execution_id}'
+        assert snapshot['data']['nodes']['n1']['status'] == 'pending'
+        assert patch == {
+            'type': f'execution_patch:{execution_id}',
+            'data': {'status': 'completed', 'nodes': {'n1': {'status': 'completed'}}}
+        }
+        # Finished executions drop their last snapshot
+        assert execution_id not in main._last_sent
+
+
+class TestRooms:
+    """Test WebSocket rooms relaying execution updates."""
+    
+    def test_update_published_while_joining_is_delivered(self, monkeypatch):
+        """Test an update published between subscribe and snapshot reaches the socket."""
+        execution_id = 'exec-join'
+        
+        async def scenario():
+            execution = make_execution(execution_id)
+            await main.notify_execution_update(execution_id, execution)
+            
+            store_get = main.state_store.get_execution
+            
+            async def get_after_update(requested_id):
+                # The room is subscribed; publish before the snapshot is read
+                updated = execution.model_copy(deep=True)
+                updated.nodes['n1'].status = 'running'
+                await main.notify_execution_update(requested_id, updated)
+                return await store_get(requested_id)
+            
+            monkeypatch.setattr(main.state_store, 'get_execution', get_after_update)
+            
+            websocket = FakeWebSocket()
+            room = main.Room(execution_id)
+            try:
+                await room.join(websocket)
+                await wait_for(lambda: len(websocket.sent) == 2)
+            finally:
+                room.close()
+            return websocket.sent
+        
+        try:
+            snapshot, patch = asyncio.run(scenario())
+        finally:
+            main._last_sent.pop(execution_id, None)
+        
+        assert snapshot['type'] == f'execution:{execution_id}'
+        assert snapshot['data']['nodes']['n1']['status'] == 'running'
+        assert patch == {
+            'type': f'execution_patch:{execution_id}',
+            'data': {'nodes': {'n1': {'status': 'running'}}}
+        }
+    
+    def test_room_stays_open_while_a_socket_joins(self):
+        """Test the last socket leaving doesn't close a room another is joining."""
+        execution_id = 'exec-leave'
+        
+        async def scenario():
+            room = main.rooms[execution_id] = main.Room(execution_id)
+            leaving = FakeWebSocket()
+            room.sockets.add(leaving)
+            
+            joining = room.join(FakeWebSocket())
+            join_task = asyncio.create_task(joining)
+            await asyncio.sleep(0)
+            main.leave_room(execution_id, leaving)
+            await join_task
+            
+            try:
+                assert main.rooms.get(execution_id) is room
+                assert len(room.sockets) == 1
+            finally:
+                room.close()
+                main.rooms.pop(execution_id, None)
+        
+        asyncio.run(scenario())
+
+
+def make_workflow():
+    return Workflow(
+        id='wf',
+        name='Workflow',
+        nodes=[],
+        edges=[],
+        metadata=WorkflowMetadata(
+            created='2025-01-01', modified='2025-01-01', author='test', version='1'
+        )
+    )
+
+
+class TestCancellation:
+    """Test cancelling executions."""
+    
+    def test_cancel_before_start_records_cancelled(self, monkeypatch):
+        """Test a task cancelled before its first step is recorded and cleaned up."""
+        async def never_called(*args, **kwargs):
+            raise AssertionError("the workflow started")
+        
+        monkeypatch.setattr(main.workflow_engine, 'execute', never_called)
+        
+        async def scenario():
+            request = ExecutionRequest(workflow_id='wf', workflow=make_workflow())
+            execution_id = (await main.execute_workflow(request))['execution_id']
+            try:
+                await main.cancel_execution(execution_id)
+                await wait_for(lambda: execution_id not in main.execution_tasks)
+                await wait_for(lambda: not main._cancel_notifications)
+                return execution_id, await main.state_store.get_execution(execution_id)
+            finally:
+                main._last_sent.pop(execution_id, None)
+        
+        execution_id, execution = asyncio.run(scenario())
+        
+        assert execution.status == 'cancelled'
+        assert execution.end_time is not None
+        assert execution_id not in main.cancel_events
+    
+    def test_cancel_request_reaches_owning_worker(self):
+        """Test a cancel request published by another worker cancels the local task."""
+        execution_id = 'exec-remote'
+        
+        async def scenario():
+            cancellations = await main.state_store.subscribe_cancellations()
+            listener = asyncio.create_task(main.listen_for_cancellations(cancellations))
+            task = asyncio.create_task(asyncio.sleep(10))
+            event = main.cancel_events[execution_id] = asyncio.Event()
+            main.execution_tasks[execution_id] = task
+            try:
+                await main.state_store._publish(
+                    main.state_store.CANCEL_CHANNEL, execution_id.encode()
+                )
+                await asyncio.wait([task], timeout=1.0)
+                return event.is_set(), task.cancelled()
+            finally:
+                listener.cancel()
+                main.cancel_events.pop(execution_id, None)
+                main.execution_tasks.pop(execution_id, None)
+        
+        assert asyncio.run(scenario()) == (True, True)
+    
+    def test_remote_execution_status_is_left_to_its_worker(self, monkeypatch):
+        """Test cancelling an execution owned by another worker only sends the request."""
+        requested = []
+        
+        async def request_cancel(execution_id):
+            requested.append(execution_id)
+            return True
+        
+        monkeypatch.setattr(main.state_store, 'request_cancel', request_cancel)
+        
+        async def scenario():
+            execution = make_execution('exec-elsewhere')
+            await main.state_store.save_execution(execution)
+            await main.cancel_execution('exec-elsewhere')
+            return await main.state_store.get_execution('exec-elsewhere')
+        
+        execution = asyncio.run(scenario())
+        
+        assert requested == ['exec-elsewhere']
+        assert execution.status == 'running'
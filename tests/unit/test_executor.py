@@ -2,15 +2,22 @@
 Unit tests for TwinGraph executors.
 """
 
+import asyncio
+import inspect
+import sys
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 from collections import namedtuple
 import json
+import threading
 import time
 
-from twingraph.orchestration.executor import ComponentExecutor, PipelineExecutor
+from twingraph.orchestration.executor import (
+    ComponentExecutor, PipelineExecutor, _cached_git_attributes, gather_branches
+)
 from twingraph.orchestration.decorators import ComponentMetadata, ComputePlatform
 from twingraph.orchestration.config import ComponentConfig, PipelineConfig
+from twingraph.orchestration.platforms import DockerExecutor, KubernetesExecutor
 from twingraph.core.exceptions import ComponentExecutionError, PipelineExecutionError
 
 
@@ -122,6 +129,45 @@ class TestComponentExecutor:
         assert call_count == 3
         assert mock_sleep.call_count == 2
     
+    @patch('twingraph.orchestration.executor.asyncio.sleep')
+    def test_async_retry_logic(self, mock_sleep, sample_metadata):
+        """Test async retries back off without blocking the event loop."""
+        sample_metadata.config.auto_retry = True
+        sample_metadata.config.max_retries = 3
+        sample_metadata.config.retry_backoff_base = 1.0
+        sample_metadata.config.max_backoff = 1.5
+        
+        executor = ComponentExecutor(
+            metadata=sample_metadata,
+            graph_config={},
+            additional_attributes={},
+            git_tracking=False
+        )
+        
+        call_count = 0
+        def flaky_func():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise ValueError(f"Attempt {call_count} failed")
+            Output = namedtuple('Output', ['result'])
+            return Output(result='success')
+        sample_metadata.signature = inspect.signature(flaky_func)
+        
+        with patch('twingraph.orchestration.executor.time.sleep') as mock_time_sleep:
+            with patch.object(executor, 'graph_manager'):
+                result = asyncio.run(executor.execute_async(flaky_func, (), {}))
+        
+        assert result['outputs']['result'] == 'success'
+        assert mock_sleep.call_count == 2
+        mock_time_sleep.assert_not_called()
+        
+        # Jittered exponential backoff capped at max_backoff
+        first_wait = mock_sleep.call_args_list[0][0][0]
+        second_wait = mock_sleep.call_args_list[1][0][0]
+        assert 0.5 <= first_wait <= 1.5
+        assert 0.75 <= second_wait <= 2.25
+    
     def test_input_serialization(self, executor):
         """Test input serialization."""
         # Mock signature binding
@@ -211,6 +257,49 @@ class TestPipelineExecutor:
         assert result == {'result': 'completed'}
         executor.graph_manager.clear_graph.assert_called_once()
     
+    def test_pipeline_body_runs_in_graph_batch(self, executor):
+        """Test component records made by a pipeline body are batched."""
+        batch = executor.graph_manager.batch.return_value
+        
+        def test_pipeline():
+            assert batch.__enter__.called and not batch.__exit__.called
+            return 'done'
+        
+        assert executor.execute(test_pipeline, (), {}) == 'done'
+        batch.__exit__.assert_called_once()
+    
+    def test_async_pipeline_gathers_branches(self, executor):
+        """Test independent branches of an async pipeline overlap."""
+        # Each branch waits for the other, so running them one after the
+        # other breaks the barrier instead of passing
+        both_running = threading.Barrier(2, timeout=5)
+        
+        def branch(value):
+            both_running.wait()
+            return value
+        
+        async def branched_pipeline():
+            return await gather_branches(
+                lambda: branch('left'),
+                lambda: branch('right')
+            )
+        
+        result = executor.execute(branched_pipeline, (), {})
+        
+        assert result == ['left', 'right']
+    
+    def test_async_pipeline_in_running_loop(self, executor):
+        """Test an async pipeline returns an awaitable inside an event loop."""
+        async def async_pipeline():
+            return await gather_branches(lambda: 'done')
+        
+        async def caller():
+            pending = executor.execute(async_pipeline, (), {})
+            assert inspect.isawaitable(pending)
+            return await pending
+        
+        assert asyncio.run(caller()) == ['done']
+    
     def test_pipeline_error_handling(self, executor):
         """Test pipeline error handling."""
         def failing_pipeline():
@@ -274,13 +363,26 @@ class TestPipelineExecutor:
         pass
 
 
+@pytest.fixture(scope='module')
+def mock_docker_client():
+    """Share one patched Docker client across platform tests."""
+    with patch('docker.from_env') as mock_docker_from_env:
+        yield mock_docker_from_env.return_value
+
+
+@pytest.fixture
+def mock_kubernetes():
+    """Stand in for the kubernetes package, which KubernetesExecutor imports lazily."""
+    kubernetes = MagicMock()
+    with patch.dict(sys.modules, {'kubernetes': kubernetes}):
+        yield kubernetes
+
+
 class TestPlatformExecutors:
     """Test platform-specific executors."""
     
-    def test_docker_executor_script_generation(self):
+    def test_docker_executor_script_generation(self, mock_docker_client):
         """Test Docker executor script generation."""
-        from twingraph.orchestration.platforms import DockerExecutor
-        
         config = ComponentConfig(docker_image='python:3.9')
         executor = DockerExecutor(config)
         
@@ -297,16 +399,11 @@ class TestPlatformExecutors:
         assert 'return a + b' in script
         assert 'json.dumps' in script
     
-    @patch('docker.from_env')
-    def test_docker_execution(self, mock_docker_from_env):
+    def test_docker_execution(self, mock_docker_client):
         """Test Docker container execution."""
-        from twingraph.orchestration.platforms import DockerExecutor
-        
-        # Mock Docker client
-        mock_client = Mock()
         mock_container_output = json.dumps({'result': 42})
-        mock_client.containers.run.return_value = mock_container_output.encode()
-        mock_docker_from_env.return_value = mock_client
+        mock_docker_client.containers.run.reset_mock()
+        mock_docker_client.containers.run.return_value = mock_container_output.encode()
         
         config = ComponentConfig(docker_image='python:3.9')
         executor = DockerExecutor(config)
@@ -322,25 +419,61 @@ class TestPlatformExecutors:
         )
         
         assert result == {'result': 42}
-        mock_client.containers.run.assert_called_once()
+        mock_docker_client.containers.run.assert_called_once()
     
-    def test_kubernetes_executor_initialization(self):
+    def test_kubernetes_executor_initialization(self, mock_kubernetes):
         """Test Kubernetes executor initialization."""
-        from twingraph.orchestration.platforms import KubernetesExecutor
-        
         config = ComponentConfig(
             platform_config={'namespace': 'test-namespace'}
         )
         
-        with patch('twingraph.orchestration.platforms.k8s_config'):
-            with patch('twingraph.orchestration.platforms.client'):
-                executor = KubernetesExecutor(config)
-                assert executor.config == config
+        executor = KubernetesExecutor(config)
+        assert executor.config == config
+        assert executor.k8s_client is mock_kubernetes.client
+        mock_kubernetes.config.load_incluster_config.assert_called_once()
+    
+    def test_serialize_inputs_keeps_non_finite_floats(self, mock_docker_client):
+        """Test NaN and infinity survive serialization instead of becoming null."""
+        executor = DockerExecutor(ComponentConfig(docker_image='python:3.9'))
+        
+        serialized = executor.serialize_inputs((float('nan'),), {'limit': float('inf')})
+        
+        assert serialized == '{"args": [NaN], "kwargs": {"limit": Infinity}}'
+    
+    def test_serialize_inputs_leaves_none_to_orjson(self, mock_docker_client):
+        """Test None and "null" strings don't force the slower json encoder."""
+        executor = DockerExecutor(ComponentConfig(docker_image='python:3.9'))
+        
+        with patch('twingraph.orchestration.platforms.json.dumps') as json_dumps:
+            serialized = executor.serialize_inputs((None, 'null'), {})
+        
+        json_dumps.assert_not_called()
+        assert serialized == '{"args":[null,"null"],"kwargs":{}}'
 
 
 class TestHelperMethods:
     """Test helper methods in executors."""
     
+    @pytest.fixture
+    def executor(self):
+        """Create component executor instance."""
+        metadata = ComponentMetadata(
+            name='test_component',
+            signature=inspect.Signature(),
+            source_code='def test_component(): pass',
+            file_path='/test/file.py',
+            line_number=10,
+            platform=ComputePlatform.LOCAL,
+            config=ComponentConfig()
+        )
+        with patch('twingraph.orchestration.executor.GraphManager'):
+            return ComponentExecutor(
+                metadata=metadata,
+                graph_config={},
+                additional_attributes={},
+                git_tracking=False
+            )
+    
     def test_execution_id_generation(self, executor):
         """Test execution ID generation."""
         with patch('time.time', return_value=1234567890):
@@ -387,9 +520,26 @@ class TestHelperMethods:
         mock_repo.active_branch.name = 'main'
         mock_repo_class.return_value = mock_repo
         
+        _cached_git_attributes.cache_clear()
         attrs = executor._get_git_attributes()
         
         assert attrs['GitCommit'] == 'abc123'
         assert attrs['GitBranch'] == 'main'
         assert attrs['GitAuthor'] == 'Test Author'
-        assert attrs['GitMessage'] == 'Test commit message'
\ No newline at end of file
+        assert attrs['GitMessage'] == 'Test commit message'
+        
+        # Subsequent executions reuse the cached repository metadata
+        executor._get_git_attributes()
+        assert mock_repo_class.call_count == 1
+        _cached_git_attributes.cache_clear()
+    
+    @patch('git.Repo')
+    def test_git_attributes_failure_is_cached(self, mock_repo_class, executor):
+        """Test a missing repository is looked up once per run, not per call."""
+        mock_repo_class.side_effect = Exception("not a git repository")
+        
+        _cached_git_attributes.cache_clear()
+        assert executor._get_git_attributes() == {}
+        assert executor._get_git_attributes() == {}
+        assert mock_repo_class.call_count == 1
+        _cached_git_attributes.cache_clear()
@@ -0,0 +1,65 @@
+"""
+Unit tests for TwinGraph graph manager.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from twingraph.graph.graph_manager import GraphManager
+from twingraph.core.exceptions import GraphOperationError
+
+
+def component(name):
+    return {'Name': name, 'ExecutionID': f'{name}-id', 'Hash': f'{name}-hash'}
+
+
+class TestBatch:
+    """Test buffered graph writes."""
+    
+    def test_flushes_on_exit(self):
+        """Test buffered components are written when the batch exits."""
+        manager = GraphManager({})
+        
+        with patch.object(manager, 'flush') as flush:
+            with manager.batch():
+                manager.add_component_execution(component('a'), [])
+                flush.assert_not_called()
+        
+        flush.assert_called_once()
+    
+    def test_flushes_when_buffer_is_full(self):
+        """Test a buffer reaching batch_size is written before the batch exits."""
+        manager = GraphManager({'batch_size': 2})
+        
+        with patch.object(manager, 'flush') as flush:
+            with manager.batch():
+                manager.add_component_execution(component('a'), [])
+                flush.assert_not_called()
+                manager.add_component_execution(component('b'), ['a-hash'])
+                flush.assert_called_once()
+    
+    def test_flush_failure_does_not_mask_error(self):
+        """Test the body's error propagates when the flush after it fails."""
+        manager = GraphManager({})
+        
+        with patch.object(
+            manager, 'flush', side_effect=GraphOperationError("graph down")
+        ) as flush:
+            with pytest.raises(RuntimeError, match="pipeline failed"):
+                with manager.batch():
+                    manager.add_component_execution(component('a'), [])
+                    raise RuntimeError("pipeline failed")
+        
+        flush.assert_called_once()
+        assert manager._batch.depth == 0
+    
+    def test_flush_failure_raises_on_success(self):
+        """Test a failed flush after a successful body is reported."""
+        manager = GraphManager({})
+        
+        with patch.object(
+            manager, 'flush', side_effect=GraphOperationError("graph down")
+        ):
+            with pytest.raises(GraphOperationError):
+                with manager.batch():
+                    manager.add_component_execution(component('a'), [])
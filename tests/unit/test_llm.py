@@ -0,0 +1,49 @@
+"""
+Unit tests for TwinGraph LLM components.
+"""
+
+import orjson
+
+from twingraph.components.llm import _JSONObjectScanner
+
+
+def scan(chunks):
+    scanner = _JSONObjectScanner()
+    return [obj for chunk in chunks for obj in scanner.feed(chunk)]
+
+
+class TestJSONObjectScanner:
+    """Test splitting streamed text into JSON objects."""
+    
+    def test_single_object(self):
+        """Test one complete object in one chunk."""
+        assert scan(['{"a": 1}']) == ['{"a": 1}']
+    
+    def test_prose_between_objects(self):
+        """Test prose around and between objects is dropped."""
+        objects = scan(['Here you go: {"a": 1} and "also" {"b": 2}. Done.'])
+        assert objects == ['{"a": 1}', '{"b": 2}']
+    
+    def test_braces_inside_strings(self):
+        """Test braces and escaped quotes in strings don't change depth."""
+        text = '{"code": "if (x) { return \\"}\\"; }", "n": {"m": 1}}'
+        objects = scan([text])
+        assert objects == [text]
+        assert orjson.loads(objects[0])['n'] == {'m': 1}
+    
+    def test_object_split_across_chunks(self):
+        """Test an object is assembled from chunks split at any point."""
+        text = 'prose {"a": {"b": "x}"}, "c": [1, 2]} tail'
+        for size in range(1, len(text)):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert scan(chunks) == ['{"a": {"b": "x}"}, "c": [1, 2]}']
+    
+    def test_escape_split_across_chunks(self):
+        """Test an escape sequence split between chunks stays in the string."""
+        assert scan(['{"a": "\\', '"}"}']) == ['{"a": "\\"}"}']
+    
+    def test_incomplete_object_is_not_returned(self):
+        """Test an object still open at the end of the stream isn't emitted."""
+        scanner = _JSONObjectScanner()
+        assert scanner.feed('{"a": {"b": 1}') == []
+        assert scanner.feed('}') == ['{"a": {"b": 1}}']
@@ -0,0 +1,87 @@
+"""
+Unit tests for TwinGraph logging.
+"""
+
+import logging
+import queue
+import time
+
+import pytest
+
+from twingraph.core import logging as twingraph_logging
+from twingraph.core.logging import BatchingHandler, BatchingQueueListener
+
+
+def make_record(message, level=logging.INFO):
+    return logging.LogRecord('test', level, __file__, 1, message, None, None)
+
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Plain-message file handler, closed after the test."""
+    handler = logging.FileHandler(tmp_path / 'test.log')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    yield handler
+    handler.close()
+
+
+def read_lines(handler):
+    with open(handler.baseFilename) as f:
+        return f.read().splitlines()
+
+
+class TestBatchingHandler:
+    """Test batched log file writes."""
+    
+    def test_buffers_until_flush(self, file_handler):
+        """Test records are held until the batch is flushed, then written in order."""
+        batch = BatchingHandler(file_handler)
+        batch.handle(make_record('first'))
+        batch.handle(make_record('second'))
+        
+        assert read_lines(file_handler) == []
+        batch.flush()
+        assert read_lines(file_handler) == ['first', 'second']
+    
+    def test_error_flushes_immediately(self, file_handler):
+        """Test an ERROR record writes out the batch with it."""
+        batch = BatchingHandler(file_handler)
+        batch.handle(make_record('before'))
+        batch.handle(make_record('failure', logging.ERROR))
+        
+        assert read_lines(file_handler) == ['before', 'failure']
+    
+    def test_bad_record_is_skipped(self, file_handler, monkeypatch):
+        """Test a record that can't be formatted doesn't lose the others."""
+        errors = []
+        monkeypatch.setattr(file_handler, 'handleError', errors.append)
+        batch = BatchingHandler(file_handler)
+        bad = logging.LogRecord('test', logging.INFO, __file__, 1, '%d', ('x',), None)
+        
+        batch.handle(make_record('good'))
+        batch.handle(bad)
+        batch.flush()
+        
+        assert read_lines(file_handler) == ['good']
+        assert errors == [bad]
+
+
+class TestBatchingQueueListener:
+    """Test the listener writing batches out when the queue goes idle."""
+    
+    def test_flushes_when_idle(self, file_handler, monkeypatch):
+        """Test the last records before a quiet spell are written without new ones."""
+        monkeypatch.setattr(twingraph_logging, '_BATCH_INTERVAL', 0.2)
+        batch = BatchingHandler(file_handler)
+        listener = BatchingQueueListener(queue.Queue(), batch)
+        listener.start()
+        try:
+            listener.queue.put(make_record('quiet'))
+            deadline = time.monotonic() + 2.0
+            while not read_lines(file_handler):
+                assert time.monotonic() < deadline, "batch was never flushed"
+                time.sleep(0.01)
+        finally:
+            listener.stop()
+        
+        assert read_lines(file_handler) == ['quiet']
@@ -0,0 +1,161 @@
+"""
+Unit tests for TwinGraph telemetry.
+"""
+
+import contextvars
+import threading
+from unittest.mock import Mock, call
+
+import pytest
+
+from twingraph.core import telemetry
+from twingraph.core.telemetry import TelemetryManager, _MetricBatch
+
+
+@pytest.fixture
+def manager():
+    """Enabled manager with mock instruments and no span export."""
+    manager = TelemetryManager(enabled=False)
+    manager.enabled = True
+    manager._tracing_off = True
+    manager.component_counter = Mock()
+    manager.component_duration = Mock()
+    manager.error_counter = Mock()
+    manager.active_workflows = Mock()
+    return manager
+
+
+class TestMetricBatch:
+    """Test the per-workflow metric batch."""
+    
+    def test_drain_empties_the_batch(self):
+        """Test drain returns everything added and starts a new batch."""
+        batch = _MetricBatch()
+        key = ('load', 'io', None)
+        batch.add_execution(key)
+        batch.add_execution(key)
+        batch.add_duration(key, 1.5)
+        batch.add_error(('load', 'io', 'ValueError'))
+        
+        executions, durations, errors = batch.drain()
+        
+        assert executions == {key: 2}
+        assert durations == {key: [1.5]}
+        assert errors == {('load', 'io', 'ValueError'): 1}
+        assert batch.drain() == ({}, {}, {})
+        assert batch.size == 0
+    
+    def test_closed_batch_rejects_metrics(self):
+        """Test metrics added after closing are refused for direct recording."""
+        batch = _MetricBatch()
+        batch.drain(close=True)
+        key = ('load', 'io', None)
+        
+        assert not batch.add_execution(key)
+        assert not batch.add_duration(key, 1.0)
+        assert not batch.add_error(key)
+    
+    def test_full(self, monkeypatch):
+        """Test the batch reports full once it holds the size limit."""
+        monkeypatch.setattr(telemetry, '_METRIC_BATCH_SIZE', 2)
+        batch = _MetricBatch()
+        batch.add_duration(('a', 'io', None), 1.0)
+        assert not batch.full
+        batch.add_duration(('a', 'io', None), 2.0)
+        assert batch.full
+    
+    def test_concurrent_adds(self):
+        """Test durations added from several threads are all kept."""
+        batch = _MetricBatch()
+        key = ('a', 'io', None)
+        
+        def add():
+            for _ in range(1000):
+                batch.add_duration(key, 1.0)
+        
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert batch.size == 4000
+        assert len(batch.drain()[1][key]) == 4000
+
+
+class TestWorkflowMetrics:
+    """Test components batching their metrics inside a traced workflow."""
+    
+    def test_recorded_when_workflow_ends(self, manager):
+        """Test component metrics inside a workflow are recorded once it exits."""
+        @manager.trace_component('io')
+        def load():
+            return [1, 2]
+        
+        @manager.trace_component('io')
+        def fail():
+            raise ValueError("bad input")
+        
+        with manager.trace_workflow('wf'):
+            load()
+            load()
+            with pytest.raises(ValueError):
+                fail()
+            manager.component_counter.add.assert_not_called()
+            manager.component_duration.record.assert_not_called()
+            manager.error_counter.add.assert_not_called()
+        
+        labels = {'component': 'load', 'type': 'io'}
+        assert call(2, labels) in manager.component_counter.add.call_args_list
+        assert manager.component_duration.record.call_count == 2
+        manager.error_counter.add.assert_called_once_with(
+            1, {'component': 'fail', 'type': 'io', 'error': 'ValueError'}
+        )
+    
+    def test_outside_workflow_records_directly(self, manager):
+        """Test a component outside any workflow records its metrics at once."""
+        @manager.trace_component('io')
+        def load():
+            return None
+        
+        load()
+        
+        manager.component_counter.add.assert_called_once_with(
+            1, {'component': 'load', 'type': 'io'}
+        )
+        manager.component_duration.record.assert_called_once()
+    
+    def test_component_finishing_after_workflow_records_directly(self, manager):
+        """Test a component outliving its workflow isn't lost in the closed batch."""
+        started = threading.Event()
+        release = threading.Event()
+        
+        @manager.trace_component('compute')
+        def slow():
+            started.set()
+            release.wait(5)
+        
+        with manager.trace_workflow('wf'):
+            # Threads don't inherit the context, so run the component in it
+            context = contextvars.copy_context()
+            thread = threading.Thread(target=context.run, args=(slow,))
+            thread.start()
+            started.wait(5)
+        release.set()
+        thread.join()
+        
+        manager.component_duration.record.assert_called_once()
+    
+    def test_full_batch_is_recorded_early(self, manager, monkeypatch):
+        """Test a long workflow records its batch when it fills up."""
+        monkeypatch.setattr(telemetry, '_METRIC_BATCH_SIZE', 2)
+        
+        @manager.trace_component('io')
+        def load():
+            return None
+        
+        with manager.trace_workflow('wf'):
+            load()
+            manager.component_duration.record.assert_not_called()
+            load()
+            assert manager.component_duration.record.call_count == 2
@@ -0,0 +1,57 @@
+"""
+Unit tests for the TwinGraph workflow engine.
+"""
+
+import pytest
+
+from twingraph.core.workflow_engine import WorkflowEngine
+
+
+@pytest.fixture(scope='module')
+def engine():
+    """Share one engine; plugin discovery runs once."""
+    return WorkflowEngine()
+
+
+class TestTopologicalLevels:
+    """Test grouping workflow nodes into dependency levels."""
+    
+    def test_diamond(self, engine):
+        """Test independent branches share a level between their join points."""
+        graph = {'a': ['b', 'c'], 'b': ['d'], 'c': ['d'], 'd': []}
+        assert engine._topological_levels(graph) == [['a'], ['b', 'c'], ['d']]
+    
+    def test_node_waits_for_its_deepest_dependency(self, engine):
+        """Test a node with dependencies at several depths runs after the last."""
+        graph = {'a': ['b', 'c'], 'b': ['c'], 'c': []}
+        assert engine._topological_levels(graph) == [['a'], ['b'], ['c']]
+    
+    def test_disconnected_nodes(self, engine):
+        """Test nodes without edges all start in the first level."""
+        assert engine._topological_levels({'a': [], 'b': [], 'c': []}) == [['a', 'b', 'c']]
+    
+    def test_edges_to_unknown_nodes_are_ignored(self, engine):
+        """Test an edge to a missing node doesn't block or add anything."""
+        assert engine._topological_levels({'a': ['missing'], 'b': []}) == [['a', 'b']]
+    
+    def test_empty_graph(self, engine):
+        """Test an empty workflow has no levels."""
+        assert engine._topological_levels({}) == []
+    
+    def test_long_chain(self, engine):
+        """Test a deep chain is sorted without recursion limits."""
+        size = 5000
+        graph = {i: [i + 1] for i in range(size - 1)}
+        graph[size - 1] = []
+        assert engine._topological_sort(graph) == list(range(size))
+    
+    def test_cycle_raises(self, engine):
+        """Test a cycle is reported instead of silently dropping nodes."""
+        graph = {'a': ['b'], 'b': ['c'], 'c': ['a'], 'd': []}
+        with pytest.raises(ValueError, match="Cycle detected"):
+            engine._topological_levels(graph)
+    
+    def test_self_loop_raises(self, engine):
+        """Test a node depending on itself is a cycle."""
+        with pytest.raises(ValueError, match="Cycle detected"):
+            engine._topological_levels({'a': ['a']})
@@ -10,6 +10,7 @@ import asyncio
 from datetime import datetime
 import json
 
+import orjson
 import strawberry
 from strawberry.types import Info
 from strawberry.subscriptions import GRAPHQL_TRANSPORT_WS_PROTOCOL
@@ -106,6 +107,20 @@ class GraphVisualizationUpdate:
     edges: List[Dict[str, Any]]
     layout: Optional[str] = "hierarchical"
     timestamp: datetime = strawberry.field(default_factory=datetime.utcnow)
+    _serialized: strawberry.Private[Optional[bytes]] = None
+    
+    def serialize(self) -> bytes:
+        """Encode nodes and edges once; every subscriber reuses the bytes."""
+        if self._serialized is None:
+            self._serialized = orjson.dumps(
+                {'nodes': self.nodes, 'edges': self.edges}
+            )
+        return self._serialized
+    
+    @strawberry.field
+    def payload(self) -> str:
+        """Nodes and edges as a pre-encoded JSON document."""
+        return self.serialize().decode()
 
 
 @strawberry.type
@@ -148,6 +163,7 @@ class EventManager:
     
     async def publish_graph_update(self, update: GraphVisualizationUpdate):
         """Publish graph visualization update."""
+        update.serialize()
         for queue in self._subscribers['graph']:
             await queue.put(update)
     
@@ -1,27 +1,60 @@
 # SPDX-License-Identifier: MIT-0
 # Copyright (c) 2025 TwinGraph Contributors
 
-from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Any, Optional
-import json
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, Any, Optional, Set
+import orjson
 import asyncio
+import re
 import uuid
 import os
+import time
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from ..orchestration.orchestration_tools import component, pipeline
 from ..core.workflow_engine import WorkflowEngine
 from ..graph.graph_manager import GraphManager
 from .models import Workflow, ExecutionRequest, ExecutionStatus, NodeStatus
+from .storage import create_state_store
 from .graphql_api import graphql_router, publish_node_status_update, publish_execution_progress
 from ..core.telemetry import initialize_telemetry, trace_component
 
 # Initialize telemetry
 telemetry = initialize_telemetry(service_name="twingraph-api")
 
-app = FastAPI(title="TwinGraph API", version="2.0.0")
+# Workflow and execution state; set TWINGRAPH_REDIS_URL to share it
+# between several API workers
+state_store = create_state_store(os.getenv('TWINGRAPH_REDIS_URL'))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Subscribed before serving so no cancel request is missed
+    cancellations = await state_store.subscribe_cancellations()
+    listener = asyncio.create_task(listen_for_cancellations(cancellations))
+    yield
+    listener.cancel()
+    for room in rooms.values():
+        room.close()
+    await state_store.close()
+    _graph_pool.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="TwinGraph API",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Add GraphQL endpoint
 app.include_router(graphql_router, prefix="/graphql")
@@ -35,16 +68,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage (replace with database in production)
-workflows_db: Dict[str, Workflow] = {}
-executions_db: Dict[str, ExecutionStatus] = {}
-websocket_connections: Dict[str, List[WebSocket]] = {}
+# Graph responses can run to megabytes; level 4 keeps compression cheap
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
+# Timestamps are re-formatted at most every half second (process-local)
+_last_ts = [0.0, ""]
+
+def _iso_now() -> str:
+    """Current local time as ISO 8601, cached for up to 0.5s"""
+    t = time.time()
+    if t - _last_ts[0] > 0.5:
+        _last_ts[:] = [t, datetime.fromtimestamp(t).isoformat()]
+    return _last_ts[1]
+
+
+class Room:
+    """WebSockets on this worker subscribed to one execution.
+    
+    A single broadcast task drains the execution's published updates and
+    sends each one to every socket concurrently, so a slow client no longer
+    delays the others and failed sockets are pruned after the send.
+    """
+    
+    def __init__(self, execution_id: str):
+        self.execution_id = execution_id
+        self.sockets: Set[WebSocket] = set()
+        # Held while a message, or a joining socket's snapshot, is sent so
+        # no socket gets a patch ahead of the snapshot it applies to
+        self._sending = asyncio.Lock()
+        self._joining = 0
+        self._subscribed = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._broadcast())
+        self._task.add_done_callback(self._stopped)
+    
+    @property
+    def empty(self) -> bool:
+        return not self.sockets and not self._joining
+    
+    async def join(self, websocket: WebSocket):
+        """Send a socket the execution's current state and add it to the room.
+        
+        The snapshot is read only once the room is subscribed, so an update
+        published meanwhile is either in it or delivered after it.
+        """
+        self._joining += 1
+        try:
+            await asyncio.shield(self._subscribed)
+            async with self._sending:
+                execution = await state_store.get_execution(self.execution_id)
+                if execution is not None:
+                    await websocket.send_text(
+                        execution_snapshot_message(execution).decode()
+                    )
+                self.sockets.add(websocket)
+        finally:
+            self._joining -= 1
+    
+    async def _broadcast(self):
+        subscription = await state_store.subscribe(self.execution_id)
+        self._subscribed.set_result(None)
+        try:
+            async for message in subscription:
+                text = message.decode()
+                async with self._sending:
+                    sockets = list(self.sockets)
+                    results = await asyncio.gather(
+                        *(websocket.send_text(text) for websocket in sockets),
+                        return_exceptions=True
+                    )
+                # Remove dead connections after the send, never during it
+                dead = [
+                    websocket for websocket, result in zip(sockets, results)
+                    if isinstance(result, Exception)
+                ]
+                self.sockets -= set(dead)
+        finally:
+            await subscription.close()
+    
+    def _stopped(self, task: asyncio.Task):
+        # Fail joiners still waiting if the room never subscribed
+        if not self._subscribed.done():
+            error = None if task.cancelled() else task.exception()
+            self._subscribed.set_exception(
+                error or RuntimeError(f"Room {self.execution_id} closed")
+            )
+    
+    def close(self):
+        self._task.cancel()
+
+
+rooms: Dict[str, Room] = {}
 
 workflow_engine = WorkflowEngine()
 
-# Get graph endpoint from environment or use default
+# Cancellation handles for executions running in this worker
+cancel_events: Dict[str, asyncio.Event] = {}
+execution_tasks: Dict[str, asyncio.Task] = {}
+
+# The Gremlin client is synchronous; run its calls off the event loop on a
+# bounded pool so traffic spikes queue here instead of exhausting threads
+GRAPH_POOL_SIZE = 16
+
+# Get graph endpoint from environment or use default; give every graph
+# thread its own Gremlin connection
 graph_endpoint = os.getenv('TWINGRAPH_GREMLIN_ENDPOINT', 'ws://localhost:8182')
-graph_manager = GraphManager({'graph_endpoint': graph_endpoint})
+graph_manager = GraphManager({
+    'graph_endpoint': graph_endpoint,
+    'connection_pool_size': GRAPH_POOL_SIZE
+})
+_graph_pool = ThreadPoolExecutor(max_workers=GRAPH_POOL_SIZE, thread_name_prefix="graph")
+_graph_slots = asyncio.Semaphore(GRAPH_POOL_SIZE)
+
+async def run_graph_call(func, *args, **kwargs):
+    """Run a blocking graph_manager call in the graph thread pool"""
+    async with _graph_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _graph_pool, functools.partial(func, *args, **kwargs)
+        )
 
 @app.get("/")
 async def root():
@@ -52,41 +193,53 @@ async def root():
 
 @app.get("/api/workflows")
 async def list_workflows():
-    return list(workflows_db.values())
+    return await state_store.list_workflows()
 
 @app.get("/api/workflows/{workflow_id}")
 async def get_workflow(workflow_id: str):
-    if workflow_id not in workflows_db:
+    workflow = await state_store.get_workflow(workflow_id)
+    if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
-    return workflows_db[workflow_id]
+    return workflow
 
-@app.post("/api/workflows/{workflow_id}")
-async def save_workflow(workflow_id: str, workflow: Workflow):
-    workflows_db[workflow_id] = workflow
+@app.post(
+    "/api/workflows/{workflow_id}",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": Workflow.model_json_schema()}},
+            "required": True
+        }
+    }
+)
+async def save_workflow(workflow_id: str, request: Request):
+    # Validate the raw body in pydantic-core instead of json.loads + dict walk
+    try:
+        workflow = Workflow.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    await state_store.save_workflow(workflow_id, workflow)
     return {"message": "Workflow saved successfully"}
 
 @app.delete("/api/workflows/{workflow_id}")
 async def delete_workflow(workflow_id: str):
-    if workflow_id not in workflows_db:
+    if not await state_store.delete_workflow(workflow_id):
         raise HTTPException(status_code=404, detail="Workflow not found")
-    del workflows_db[workflow_id]
     return {"message": "Workflow deleted successfully"}
 
 @app.post("/api/executions")
 async def execute_workflow(request: ExecutionRequest):
     execution_id = str(uuid.uuid4())
     
-    if request.workflow_id not in workflows_db and not request.workflow:
+    workflow = request.workflow or await state_store.get_workflow(request.workflow_id)
+    if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    workflow = request.workflow or workflows_db[request.workflow_id]
-    
     # Initialize execution status
     execution_status = ExecutionStatus(
         workflow_id=workflow.id,
         execution_id=execution_id,
         status="pending",
-        start_time=datetime.now().isoformat(),
+        start_time=_iso_now(),
         nodes={}
     )
     
@@ -96,62 +249,108 @@ async def execute_workflow(request: ExecutionRequest):
             status="pending"
         )
     
-    executions_db[execution_id] = execution_status
+    await state_store.save_execution(execution_status)
     
     # Start execution in background
-    asyncio.create_task(run_workflow_async(execution_id, workflow))
+    cancel_events[execution_id] = asyncio.Event()
+    task = execution_tasks[execution_id] = asyncio.create_task(
+        run_workflow_async(execution_status, workflow)
+    )
+    task.add_done_callback(functools.partial(execution_finished, execution_status))
     
     return {"execution_id": execution_id}
 
 @app.get("/api/executions/{execution_id}")
 async def get_execution_status(execution_id: str):
-    if execution_id not in executions_db:
+    execution = await state_store.get_execution(execution_id)
+    if execution is None:
         raise HTTPException(status_code=404, detail="Execution not found")
-    return executions_db[execution_id]
+    return execution
 
 @app.post("/api/executions/{execution_id}/cancel")
 async def cancel_execution(execution_id: str):
-    if execution_id not in executions_db:
+    execution = await state_store.get_execution(execution_id)
+    if execution is None:
         raise HTTPException(status_code=404, detail="Execution not found")
     
-    execution = executions_db[execution_id]
+    # The worker running the execution records the cancellation itself
+    if cancel_local_execution(execution_id):
+        return {"message": "Execution cancelled"}
+    if await state_store.request_cancel(execution_id):
+        return {"message": "Execution cancelled"}
+    
     execution.status = "cancelled"
-    execution.end_time = datetime.now().isoformat()
+    execution.end_time = _iso_now()
     
     await notify_execution_update(execution_id, execution)
     
     return {"message": "Execution cancelled"}
 
+# Short-lived cache of graph reads so repeated dashboard polls skip Gremlin
+GRAPH_CACHE_TTL = 5.0
+GRAPH_CACHE_SIZE = 256
+_graph_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+async def cached_graph_read(key: tuple, fetch):
+    """Return fetch() for key, reusing results younger than GRAPH_CACHE_TTL"""
+    now = time.monotonic()
+    entry = _graph_cache.get(key)
+    if entry and entry[0] > now:
+        _graph_cache.move_to_end(key)
+        return entry[1]
+    
+    value = await run_graph_call(fetch)
+    _graph_cache[key] = (now + GRAPH_CACHE_TTL, value)
+    _graph_cache.move_to_end(key)
+    if len(_graph_cache) > GRAPH_CACHE_SIZE:
+        _graph_cache.popitem(last=False)
+    return value
+
+async def search_by_execution(execution_id: str) -> List[Dict[str, Any]]:
+    return await cached_graph_read(
+        ('execution', execution_id),
+        lambda: graph_manager.search_components(execution_id=execution_id)
+    )
+
+async def search_all(limit: int) -> List[Dict[str, Any]]:
+    return await cached_graph_read(
+        ('full', limit),
+        lambda: graph_manager.search_components(limit=limit)
+    )
+
+@functools.lru_cache(maxsize=100_000)
+def _parse_parents(parent_hashes: str) -> tuple:
+    """Parse a ParentHashes JSON string; identical strings parse once"""
+    return tuple(orjson.loads(parent_hashes))
+
+def parse_parents(parent_hashes: Any) -> tuple:
+    if isinstance(parent_hashes, str):
+        return _parse_parents(parent_hashes)
+    return tuple(parent_hashes)
+
+def build_dependency_graph(nodes: List[Dict[str, Any]], node_ids: List[str]) -> Dict[str, Any]:
+    """Map nodes by id and link each one to its parent hashes"""
+    return {
+        'nodes': dict(zip(node_ids, nodes)),
+        'edges': [
+            {'from': parent_hash, 'to': node_id, 'type': 'DEPENDS_ON'}
+            for node_id, node in zip(node_ids, nodes) if 'ParentHashes' in node
+            for parent_hash in parse_parents(node['ParentHashes'])
+        ]
+    }
+
 # Graph API endpoints
 @app.get("/api/graph/execution/{execution_id}")
 async def get_execution_graph(execution_id: str):
     """Get the graph for a specific execution."""
     try:
         # Get all nodes related to this execution
-        nodes = graph_manager.search_components(execution_id=execution_id)
-        
-        # Build graph structure
-        graph_data = {
-            'nodes': {},
-            'edges': []
-        }
-        
-        for node in nodes:
-            node_id = node.get('Hash', node.get('ExecutionID'))
-            graph_data['nodes'][node_id] = node
-            
-            # Add edges based on parent hashes
-            if 'ParentHashes' in node:
-                parent_hashes = json.loads(node['ParentHashes']) if isinstance(node['ParentHashes'], str) else node['ParentHashes']
-                for parent_hash in parent_hashes:
-                    graph_data['edges'].append({
-                        'from': parent_hash,
-                        'to': node_id,
-                        'type': 'DEPENDS_ON'
-                    })
-        
-        return graph_data
+        nodes = await search_by_execution(execution_id)
         
+        # Build graph structure with edges based on parent hashes
+        node_ids = [node.get('Hash', node.get('ExecutionID')) for node in nodes]
+        return build_dependency_graph(nodes, node_ids)
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -159,7 +358,9 @@ async def get_execution_graph(execution_id: str):
 async def get_component_graph(component_hash: str, max_depth: int = 10):
     """Get the graph starting from a specific component."""
     try:
-        graph_data = graph_manager.get_execution_graph(component_hash, max_depth)
+        graph_data = await run_graph_call(
+            graph_manager.get_execution_graph, component_hash, max_depth
+        )
         return graph_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -168,29 +369,12 @@ async def get_component_graph(component_hash: str, max_depth: int = 10):
 async def get_full_graph(limit: int = 100):
     """Get the full graph with optional limit."""
     try:
-        components = graph_manager.search_components(limit=limit)
-        
-        graph_data = {
-            'nodes': {},
-            'edges': []
-        }
-        
-        for component in components:
-            node_id = component.get('Hash', str(component.get('id')))
-            graph_data['nodes'][node_id] = component
-            
-            # Add edges
-            if 'ParentHashes' in component:
-                parent_hashes = json.loads(component['ParentHashes']) if isinstance(component['ParentHashes'], str) else component['ParentHashes']
-                for parent_hash in parent_hashes:
-                    graph_data['edges'].append({
-                        'from': parent_hash,
-                        'to': node_id,
-                        'type': 'DEPENDS_ON'
-                    })
-        
-        return graph_data
+        components = await search_all(limit)
         
+        node_ids = [c.get('Hash', str(c.get('id'))) for c in components]
+        # Returned directly so the largest payload skips jsonable_encoder
+        return ORJSONResponse(build_dependency_graph(components, node_ids))
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -198,11 +382,42 @@ async def get_full_graph(limit: int = 100):
 async def get_graph_statistics():
     """Get graph statistics."""
     try:
-        stats = graph_manager.get_statistics()
+        stats = await cached_graph_read(('statistics',), graph_manager.get_statistics)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def handle_all_vertices(query: str) -> Dict[str, Any]:
+    """Return all vertices"""
+    # This would execute against the actual TinkerGraph/Neptune instance
+    return {
+        "vertices": [
+            {
+                "id": "node1",
+                "label": "Component A",
+                "properties": {"Platform": "Docker", "Type": "component"}
+            },
+            {
+                "id": "node2", 
+                "label": "Component B",
+                "properties": {"Platform": "Lambda", "Type": "component"}
+            }
+        ],
+        "edges": [
+            {
+                "id": "edge1",
+                "from": "node1",
+                "to": "node2",
+                "label": "connects"
+            }
+        ]
+    }
+
+# Gremlin query patterns and their handlers, tried in order
+GREMLIN_HANDLERS = [
+    (re.compile(r"g\.V\(\)"), handle_all_vertices),
+]
+
 @app.post("/api/graph/gremlin")
 async def execute_gremlin_query(request: Dict[str, str]):
     """Execute a Gremlin query on the graph database."""
@@ -211,34 +426,10 @@ async def execute_gremlin_query(request: Dict[str, str]):
         raise HTTPException(status_code=400, detail="Query is required")
     
     try:
-        # This would execute against the actual TinkerGraph/Neptune instance
-        # For now, return mock data based on query
-        if "g.V()" in query:
-            # Return all vertices
-            return {
-                "vertices": [
-                    {
-                        "id": "node1",
-                        "label": "Component A",
-                        "properties": {"Platform": "Docker", "Type": "component"}
-                    },
-                    {
-                        "id": "node2", 
-                        "label": "Component B",
-                        "properties": {"Platform": "Lambda", "Type": "component"}
-                    }
-                ],
-                "edges": [
-                    {
-                        "id": "edge1",
-                        "from": "node1",
-                        "to": "node2",
-                        "label": "connects"
-                    }
-                ]
-            }
-        else:
-            return {"vertices": [], "edges": []}
+        for pattern, handler in GREMLIN_HANDLERS:
+            if pattern.search(query):
+                return await handler(query)
+        return {"vertices": [], "edges": []}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -252,7 +443,8 @@ async def search_components(
 ):
     """Search for components with filters."""
     try:
-        components = graph_manager.search_components(
+        components = await run_graph_call(
+            graph_manager.search_components,
             name=name,
             platform=platform,
             start_time=start_time,
@@ -266,6 +458,8 @@ async def search_components(
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    # Rooms this socket joined, so disconnect only visits those
+    subscriptions: Set[str] = set()
     
     try:
         while True:
@@ -273,54 +467,138 @@ async def websocket_endpoint(websocket: WebSocket):
             
             if data["type"] == "subscribe":
                 execution_id = data["execution_id"]
-                if execution_id not in websocket_connections:
-                    websocket_connections[execution_id] = []
-                websocket_connections[execution_id].append(websocket)
+                room = rooms.get(execution_id)
+                if room is None:
+                    room = rooms[execution_id] = Room(execution_id)
+                subscriptions.add(execution_id)
+                
+                # Later updates arrive as patches against this snapshot
+                await room.join(websocket)
             
             elif data["type"] == "unsubscribe":
-                execution_id = data["execution_id"]
-                if execution_id in websocket_connections:
-                    websocket_connections[execution_id].remove(websocket)
+                leave_room(data["execution_id"], websocket)
+                subscriptions.discard(data["execution_id"])
     
     except Exception as e:
         # Clean up connections
-        for execution_id, connections in websocket_connections.items():
-            if websocket in connections:
-                connections.remove(websocket)
+        for execution_id in subscriptions:
+            leave_room(execution_id, websocket)
+
+def leave_room(execution_id: str, websocket: WebSocket):
+    """Remove a socket from a room, closing the room once it is empty"""
+    room = rooms.get(execution_id)
+    if room is None:
+        return
+    room.sockets.discard(websocket)
+    if room.empty:
+        room.close()
+        del rooms[execution_id]
 
-async def run_workflow_async(execution_id: str, workflow: Workflow):
+async def run_workflow_async(execution: ExecutionStatus, workflow: Workflow):
     """Execute workflow using TwinGraph engine"""
-    execution = executions_db[execution_id]
+    execution_id = execution.execution_id
     execution.status = "running"
     
-    await notify_execution_update(execution_id, execution)
-    
     try:
+        await notify_execution_update(execution_id, execution)
+        
         # Convert workflow to TwinGraph format and execute
-        result = await workflow_engine.execute(workflow, execution_id)
+        result = await workflow_engine.execute(
+            workflow, execution_id, cancel_events.get(execution_id)
+        )
         
         execution.status = "completed"
-        execution.end_time = datetime.now().isoformat()
+        execution.end_time = _iso_now()
+        
+    except asyncio.CancelledError:
+        execution.status = "cancelled"
+        execution.end_time = _iso_now()
         
     except Exception as e:
         execution.status = "failed"
-        execution.end_time = datetime.now().isoformat()
+        execution.end_time = _iso_now()
         execution.error = str(e)
     
-    await notify_execution_update(execution_id, execution)
+    # Shielded so the final status is published even if cancelled again
+    await asyncio.shield(notify_execution_update(execution_id, execution))
+
+def cancel_local_execution(execution_id: str) -> bool:
+    """Cancel an execution if it runs in this worker"""
+    task = execution_tasks.get(execution_id)
+    if task is None:
+        return False
+    cancel_events[execution_id].set()
+    task.cancel()
+    return True
+
+async def listen_for_cancellations(cancellations):
+    """Cancel the executions other workers were asked to cancel"""
+    try:
+        async for message in cancellations:
+            cancel_local_execution(message.decode())
+    finally:
+        await cancellations.close()
+
+# Final updates of executions cancelled before they started
+_cancel_notifications: Set[asyncio.Task] = set()
+
+def execution_finished(execution: ExecutionStatus, task: asyncio.Task):
+    """Drop the handles of a finished execution task"""
+    execution_id = execution.execution_id
+    cancel_events.pop(execution_id, None)
+    execution_tasks.pop(execution_id, None)
+    
+    # A task cancelled before its first step never ran its own cleanup
+    if task.cancelled() and execution.status == "pending":
+        execution.status = "cancelled"
+        execution.end_time = _iso_now()
+        notification = asyncio.create_task(notify_execution_update(execution_id, execution))
+        _cancel_notifications.add(notification)
+        notification.add_done_callback(_cancel_notifications.discard)
+
+# Last state published per execution, used to send only what changed
+_last_sent: Dict[str, Dict[str, Any]] = {}
+
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """RFC 7386 JSON merge patch that turns old into new"""
+    patch = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = merge_patch(previous, value)
+            if nested:
+                patch[key] = nested
+        elif key not in old or previous != value:
+            patch[key] = value
+    return patch
+
+def execution_snapshot_message(execution: ExecutionStatus) -> bytes:
+    return orjson.dumps({
+        "type": f"execution:{execution.execution_id}",
+        "data": execution.model_dump(mode="json")
+    })
 
 async def notify_execution_update(execution_id: str, execution: ExecutionStatus):
-    """Notify all subscribed websockets about execution updates"""
-    if execution_id in websocket_connections:
-        for websocket in websocket_connections[execution_id]:
-            try:
-                await websocket.send_json({
-                    "type": f"execution:{execution_id}",
-                    "data": execution.dict()
-                })
-            except:
-                # Remove dead connections
-                websocket_connections[execution_id].remove(websocket)
+    """Persist an execution update and publish it to all subscribers"""
+    await state_store.save_execution(execution)
+    
+    snapshot = execution.model_dump(mode="json")
+    previous = _last_sent.get(execution_id)
+    if previous is None:
+        message = {"type": f"execution:{execution_id}", "data": snapshot}
+    else:
+        patch = merge_patch(previous, snapshot)
+        if not patch:
+            return
+        message = {"type": f"execution_patch:{execution_id}", "data": patch}
+    
+    if execution.status in ("completed", "failed", "cancelled"):
+        _last_sent.pop(execution_id, None)
+    else:
+        _last_sent[execution_id] = snapshot
+    
+    # Encoded once here; every room sends the same text to all its sockets
+    await state_store.publish(execution_id, orjson.dumps(message))
 
 if __name__ == "__main__":
     import uvicorn
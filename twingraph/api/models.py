@@ -1,11 +1,15 @@
 # SPDX-License-Identifier: MIT-0
 # Copyright (c) 2025 TwinGraph Contributors
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
 
-class PortDefinition(BaseModel):
+# Created once per port/node, so these use slotted dataclasses rather than
+# BaseModel to keep large workflows and executions small in memory
+@dataclass(config=ConfigDict(frozen=False), slots=True)
+class PortDefinition:
     id: str
     name: str
     type: Literal["string", "number", "boolean", "object", "array", "any"]
@@ -72,14 +76,15 @@ class ExecutionRequest(BaseModel):
     workflow: Optional[Workflow] = None
     parameters: Optional[Dict[str, Any]] = {}
 
-class NodeStatus(BaseModel):
+@dataclass(config=ConfigDict(frozen=False), slots=True)
+class NodeStatus:
     node_id: str
     status: Literal["pending", "running", "completed", "failed", "skipped"]
     start_time: Optional[str] = None
     end_time: Optional[str] = None
     output: Optional[Any] = None
     error: Optional[str] = None
-    logs: Optional[List[str]] = []
+    logs: Optional[List[str]] = Field(default_factory=list)
 
 class ExecutionStatus(BaseModel):
     workflow_id: str
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: MIT-0
+# Copyright (c) 2025 TwinGraph Contributors
+
+"""
+State storage for the TwinGraph API.
+
+Workflows and execution statuses live either in process memory (single
+worker, the default) or in Redis so several Uvicorn workers share state.
+Execution updates are published per execution so every worker can relay
+them to its own WebSocket subscribers.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .models import Workflow, ExecutionStatus
+
+
+class Subscription(ABC):
+    """
+    Messages published on one channel, from the moment subscribe()
+    returns until close().
+    """
+
+    def __aiter__(self):
+        return self
+
+    @abstractmethod
+    async def __anext__(self) -> bytes:
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+
+class _QueueSubscription(Subscription):
+    def __init__(self, channels: Dict[str, List[asyncio.Queue]], channel: str):
+        self._channels = channels
+        self._channel = channel
+        self._queue: asyncio.Queue = asyncio.Queue()
+        channels.setdefault(channel, []).append(self._queue)
+
+    async def __anext__(self) -> bytes:
+        return await self._queue.get()
+
+    async def close(self):
+        queues = self._channels.get(self._channel, [])
+        if self._queue in queues:
+            queues.remove(self._queue)
+        if not queues:
+            self._channels.pop(self._channel, None)
+
+
+class _PubSubSubscription(Subscription):
+    def __init__(self, pubsub: Any, channel: str):
+        self._pubsub = pubsub
+        self._channel = channel
+        self._messages = pubsub.listen()
+
+    async def __anext__(self) -> bytes:
+        async for message in self._messages:
+            if message['type'] == 'message':
+                return message['data']
+        raise StopAsyncIteration
+
+    async def close(self):
+        await self._pubsub.unsubscribe(self._channel)
+        await self._pubsub.aclose()
+
+
+class StateStore:
+    """In-process storage for workflows and executions."""
+
+    EXECUTION_PREFIX = 'twingraph:exec:'
+    CANCEL_CHANNEL = 'twingraph:cancel'
+
+    def __init__(self):
+        self._workflows: Dict[str, Workflow] = {}
+        self._executions: Dict[str, ExecutionStatus] = {}
+        self._channels: Dict[str, List[asyncio.Queue]] = {}
+
+    async def list_workflows(self) -> List[Workflow]:
+        return list(self._workflows.values())
+
+    async def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
+        return self._workflows.get(workflow_id)
+
+    async def save_workflow(self, workflow_id: str, workflow: Workflow):
+        self._workflows[workflow_id] = workflow
+
+    async def delete_workflow(self, workflow_id: str) -> bool:
+        return self._workflows.pop(workflow_id, None) is not None
+
+    async def get_execution(self, execution_id: str) -> Optional[ExecutionStatus]:
+        return self._executions.get(execution_id)
+
+    async def save_execution(self, execution: ExecutionStatus):
+        self._executions[execution.execution_id] = execution
+
+    async def publish(self, execution_id: str, message: bytes):
+        """Publish an execution update to every subscriber."""
+        await self._publish(self.EXECUTION_PREFIX + execution_id, message)
+
+    async def subscribe(self, execution_id: str) -> Subscription:
+        """
+        Subscribe to execution updates. Every update published after this
+        returns is delivered, so read a snapshot only afterwards.
+        """
+        return await self._subscribe(self.EXECUTION_PREFIX + execution_id)
+
+    async def request_cancel(self, execution_id: str) -> bool:
+        """
+        Ask the worker running an execution to cancel it. Returns False when
+        no other worker can be running it.
+        """
+        # A single worker owns everything in an in-process store
+        return False
+
+    async def subscribe_cancellations(self) -> Subscription:
+        """Subscribe to the ids of executions other workers asked to cancel."""
+        return await self._subscribe(self.CANCEL_CHANNEL)
+
+    async def _publish(self, channel: str, message: bytes):
+        for queue in self._channels.get(channel, []):
+            queue.put_nowait(message)
+
+    async def _subscribe(self, channel: str) -> Subscription:
+        return _QueueSubscription(self._channels, channel)
+
+    async def close(self):
+        pass
+
+
+class RedisStateStore(StateStore):
+    """Redis-backed storage shared by all API workers."""
+
+    WORKFLOWS_KEY = 'twingraph:workflows'
+
+    def __init__(self, url: str, max_connections: int = 50):
+        import redis.asyncio as aioredis
+
+        # The pool connects lazily on first use
+        self._redis = aioredis.from_url(url, max_connections=max_connections)
+
+    async def list_workflows(self) -> List[Workflow]:
+        values = await self._redis.hvals(self.WORKFLOWS_KEY)
+        return [Workflow.model_validate_json(value) for value in values]
+
+    async def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
+        value = await self._redis.hget(self.WORKFLOWS_KEY, workflow_id)
+        return Workflow.model_validate_json(value) if value else None
+
+    async def save_workflow(self, workflow_id: str, workflow: Workflow):
+        await self._redis.hset(self.WORKFLOWS_KEY, workflow_id, workflow.model_dump_json())
+
+    async def delete_workflow(self, workflow_id: str) -> bool:
+        return bool(await self._redis.hdel(self.WORKFLOWS_KEY, workflow_id))
+
+    async def get_execution(self, execution_id: str) -> Optional[ExecutionStatus]:
+        value = await self._redis.get(self.EXECUTION_PREFIX + execution_id)
+        return ExecutionStatus.model_validate_json(value) if value else None
+
+    async def save_execution(self, execution: ExecutionStatus):
+        await self._redis.set(
+            self.EXECUTION_PREFIX + execution.execution_id,
+            execution.model_dump_json()
+        )
+
+    async def request_cancel(self, execution_id: str) -> bool:
+        await self._redis.publish(self.CANCEL_CHANNEL, execution_id)
+        return True
+
+    async def _publish(self, channel: str, message: bytes):
+        await self._redis.publish(channel, message)
+
+    async def _subscribe(self, channel: str) -> Subscription:
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            # SUBSCRIBE is only sent above; messages published before Redis
+            # confirms it would not reach us
+            while True:
+                message = await pubsub.get_message(timeout=None)
+                if message is not None and message['type'] == 'subscribe':
+                    break
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return _PubSubSubscription(pubsub, channel)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_state_store(redis_url: Optional[str] = None) -> StateStore:
+    """Create a Redis-backed store when a URL is given, else an in-process one."""
+    if redis_url:
+        return RedisStateStore(redis_url)
+    return StateStore()
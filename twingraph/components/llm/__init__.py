@@ -9,8 +9,13 @@ from typing import AsyncIterator, Dict, Any, Optional, List, Union
 from abc import ABC, abstractmethod
 import asyncio
 import json
+import re
+import threading
+import time
 from datetime import datetime
 
+import orjson
+
 from ...orchestration.modern_decorators import streaming_llm_component
 from ...core.logging import get_logger
 
@@ -73,6 +78,8 @@ class OpenAIProvider(LLMProvider):
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider with streaming support."""
     
+    STREAM_CHUNK_SIZE = 64
+    
     def __init__(self, api_key: str, model: str = "claude-3-opus"):
         self.api_key = api_key
         self.model = model
@@ -88,28 +95,128 @@ class AnthropicProvider(LLMProvider):
         **kwargs
     ) -> AsyncIterator[Dict[str, Any]]:
         """Stream response from Claude."""
-        # Simulate Claude streaming
+        # Simulate Claude streaming in ~64-character chunks so each
+        # event-loop wakeup carries more than a single character
         response = f"Claude is thinking about: {prompt}. Here's the analysis..."
-        for char in response:
+        for i in range(0, len(response), self.STREAM_CHUNK_SIZE):
+            chunk = response[i:i + self.STREAM_CHUNK_SIZE]
             await asyncio.sleep(0.01)
             yield {
-                'content': char,
-                'tokens': 1 if char == ' ' else 0
+                'content': chunk,
+                'tokens': chunk.count(' ')
             }
 
 
 class LocalLLMProvider(LLMProvider):
-    """Local LLM provider for open-source models."""
+    """
+    Local LLM provider for open-source Hugging Face models.
     
-    def __init__(self, model_path: str, device: str = "cpu"):
+    Inference is CPU/GPU bound, so every model call runs in a worker thread
+    and never on the event loop. The model is loaded on first use, also in
+    a worker thread, and shared between provider instances with the same
+    path, device and quantization.
+    """
+    
+    _models: Dict[tuple, tuple] = {}
+    _models_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        model_path: str,
+        device: str = "cpu",
+        quantize: bool = True,
+        max_new_tokens: int = 256
+    ):
+        try:
+            import torch
+            import transformers
+        except ImportError:
+            raise ImportError(
+                "Transformers not installed. Install with: pip install torch transformers"
+            )
+        self.torch = torch
+        self.transformers = transformers
         self.model_path = model_path
         self.device = device
+        self.quantize = quantize
+        self.max_new_tokens = max_new_tokens
+        self.model = None
+        self.tokenizer = None
+    
+    async def _ensure_model(self):
+        if self.model is None:
+            self.model, self.tokenizer = await asyncio.to_thread(self._load_model)
+    
+    def _load_model(self) -> tuple:
+        key = (self.model_path, self.device, self.quantize)
+        with self._models_lock:
+            if key not in self._models:
+                self._models[key] = self._build_model()
+            return self._models[key]
+    
+    def _build_model(self) -> tuple:
+        """Load the model once, with int8 weights when quantization is on."""
+        transformers = self.transformers
+        tokenizer = transformers.AutoTokenizer.from_pretrained(self.model_path)
+        if self.quantize and self.device != "cpu":
+            # bitsandbytes int8 kernels are GPU only
+            model = transformers.AutoModelForCausalLM.from_pretrained(
+                self.model_path,
+                quantization_config=transformers.BitsAndBytesConfig(load_in_8bit=True),
+                device_map=self.device
+            )
+        else:
+            model = transformers.AutoModelForCausalLM.from_pretrained(self.model_path)
+            model.to(self.device)
+            if self.quantize:
+                model = self.torch.ao.quantization.quantize_dynamic(
+                    model, {self.torch.nn.Linear}, dtype=self.torch.qint8
+                )
+        model.eval()
+        return model, tokenizer
+    
+    def _generate_kwargs(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
+        kwargs.setdefault('max_new_tokens', self.max_new_tokens)
+        return {**inputs, **kwargs}
+    
+    def _sync_generate(self, prompt: str, **kwargs) -> str:
+        with self.torch.inference_mode():
+            inputs = self._generate_kwargs(prompt, **kwargs)
+            output = self.model.generate(**inputs)
+        prompt_length = inputs['input_ids'].shape[-1]
+        return self.tokenizer.decode(
+            output[0][prompt_length:], skip_special_tokens=True
+        )
+    
+    def _stopping_criteria(self, stop: threading.Event, criteria=None):
+        """Caller's stopping criteria plus one that ends generation once stop is set."""
+        torch = self.torch
+        
+        class StopWhenSet(self.transformers.StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full(
+                    (input_ids.shape[0],), stop.is_set(),
+                    dtype=torch.bool, device=input_ids.device
+                )
+        
+        return self.transformers.StoppingCriteriaList([*(criteria or []), StopWhenSet()])
+    
+    def _sync_stream(self, prompt: str, streamer, **kwargs):
+        try:
+            with self.torch.inference_mode():
+                self.model.generate(
+                    **self._generate_kwargs(prompt, **kwargs), streamer=streamer
+                )
+        except BaseException:
+            # Unblock the token forwarder before surfacing the error
+            streamer.end()
+            raise
         
     async def generate(self, prompt: str, **kwargs) -> str:
         """Generate from local model."""
-        # This would load and run a local model
-        await asyncio.sleep(0.2)
-        return f"Local model response: {prompt}"
+        await self._ensure_model()
+        return await asyncio.to_thread(self._sync_generate, prompt, **kwargs)
     
     async def stream(
         self, 
@@ -117,17 +224,121 @@ class LocalLLMProvider(LLMProvider):
         **kwargs
     ) -> AsyncIterator[Dict[str, Any]]:
         """Stream from local model."""
-        tokens = ["Local", "model", "streaming", "response"]
-        for token in tokens:
-            await asyncio.sleep(0.1)
-            yield {
-                'content': token + ' ',
-                'tokens': 1
-            }
+        await self._ensure_model()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        streamer = self.transformers.TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        stop = threading.Event()
+        kwargs['stopping_criteria'] = self._stopping_criteria(
+            stop, kwargs.get('stopping_criteria')
+        )
+        
+        def forward_tokens():
+            try:
+                for text in streamer:
+                    loop.call_soon_threadsafe(queue.put_nowait, text)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        generation = asyncio.create_task(
+            asyncio.to_thread(self._sync_stream, prompt, streamer, **kwargs)
+        )
+        forwarding = asyncio.create_task(asyncio.to_thread(forward_tokens))
+        try:
+            while (text := await queue.get()) is not done:
+                yield {
+                    'content': text,
+                    'tokens': 1
+                }
+        except BaseException:
+            # Closed or cancelled early: end generation at the next token
+            # rather than at max_new_tokens, and wait for both threads
+            stop.set()
+            await asyncio.gather(generation, forwarding, return_exceptions=True)
+            raise
+        await generation
+        await forwarding
+
+
+async def _coalesce(
+    chunks: AsyncIterator[Dict[str, Any]],
+    max_bytes: int = 128,
+    max_delay: float = 0.016
+) -> AsyncIterator[str]:
+    """Re-chunk provider output into pieces of ~max_bytes or ~max_delay seconds."""
+    buf: List[str] = []
+    size = 0
+    last = time.monotonic()
+    async for chunk in chunks:
+        buf.append(chunk['content'])
+        size += len(chunk['content'])
+        now = time.monotonic()
+        if size >= max_bytes or now - last > max_delay:
+            yield ''.join(buf)
+            buf.clear()
+            size = 0
+            last = now
+    if buf:
+        yield ''.join(buf)
+
+
+class _JSONObjectScanner:
+    """Single-pass brace matcher that splits streamed text into JSON objects."""
+    
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, text: str) -> List[str]:
+        """Consume text and return every object completed by it."""
+        completed = []
+        start = 0
+        for i, char in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '{':
+                if self._depth == 0:
+                    # Drop any prose between objects
+                    self._buffer.clear()
+                    start = i
+                self._depth += 1
+            elif self._depth == 0:
+                continue
+            elif char == '"':
+                self._in_string = True
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start:i + 1])
+                    completed.append(''.join(self._buffer))
+                    self._buffer.clear()
+                    start = i + 1
+        if self._depth > 0:
+            self._buffer.append(text[start:])
+        return completed
 
 
 # Pre-configured streaming components for common use cases
 
+# Section headers requested by multimodal_analysis, matched in one pass
+_SECTION_TAGS = {
+    "1. Object detection": "objects",
+    "2. Scene understanding": "scene",
+    "3. Text extraction": "text",
+    "4. Relevant insights": "insights",
+}
+_SECTION_PATTERN = re.compile("|".join(map(re.escape, _SECTION_TAGS)))
+
 @streaming_llm_component(model='gpt-4', temperature=0.7)
 async def chat_completion(
     messages: List[Dict[str, str]], 
@@ -144,9 +355,9 @@ async def chat_completion(
         async for chunk in chat_completion(messages, openai_provider):
             print(chunk, end='')
     """
-    prompt = "\n".join([f"{m['role']}: {m['content']}" for m in messages])
-    async for chunk in provider.stream(prompt):
-        yield chunk['content']
+    prompt = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    async for text in _coalesce(provider.stream(prompt)):
+        yield text
 
 
 @streaming_llm_component(model='claude-3', temperature=0.3)
@@ -177,8 +388,8 @@ async def code_generation(
     Code:
     ```{language}"""
     
-    async for chunk in provider.stream(prompt):
-        yield chunk['content']
+    async for text in _coalesce(provider.stream(prompt)):
+        yield text
 
 
 @streaming_llm_component(model='llama-3', temperature=0.5)
@@ -209,27 +420,23 @@ async def document_analysis(
     Provide structured JSON responses.
     """
     
-    current_answer = ""
+    scanner = _JSONObjectScanner()
     answer_index = 0
     
     async for chunk in provider.stream(prompt):
-        current_answer += chunk['content']
-        
-        # Detect complete JSON answers
-        if chunk['content'].strip().endswith('}'):
+        # Each character is examined once; objects are parsed only when
+        # their closing brace brings the depth back to zero
+        for answer in scanner.feed(chunk['content']):
             try:
-                # Try to parse accumulated answer
-                answer_data = json.loads(current_answer)
-                yield {
-                    'question': questions[answer_index] if answer_index < len(questions) else "Additional insight",
-                    'answer': answer_data,
-                    'timestamp': datetime.utcnow().isoformat()
-                }
-                current_answer = ""
-                answer_index += 1
-            except json.JSONDecodeError:
-                # Continue accumulating
-                pass
+                answer_data = orjson.loads(answer)
+            except orjson.JSONDecodeError:
+                continue
+            yield {
+                'question': questions[answer_index] if answer_index < len(questions) else "Additional insight",
+                'answer': answer_data,
+                'timestamp': datetime.utcnow().isoformat()
+            }
+            answer_index += 1
 
 
 @streaming_llm_component(
@@ -271,26 +478,31 @@ async def multimodal_analysis(
     section = None
     buffer = ""
     
+    def section_events(lines: List[str]):
+        nonlocal section
+        for line in lines:
+            # Detect section headers
+            for match in _SECTION_PATTERN.finditer(line):
+                section = _SECTION_TAGS[match.group()]
+            if section and line.strip():
+                yield {
+                    'type': section,
+                    'content': line.strip(),
+                    'timestamp': datetime.utcnow().isoformat()
+                }
+    
     async for chunk in provider.stream(full_prompt):
         buffer += chunk['content']
-        
-        # Detect section headers
-        if "1. Object detection" in buffer:
-            section = "objects"
-        elif "2. Scene understanding" in buffer:
-            section = "scene"
-        elif "3. Text extraction" in buffer:
-            section = "text"
-        elif "4. Relevant insights" in buffer:
-            section = "insights"
-        
-        if section and chunk['content'] == '\n':
-            yield {
-                'type': section,
-                'content': buffer.strip(),
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            buffer = ""
+        # Providers rarely send a newline as a chunk of its own, so split
+        # complete lines off the buffer and keep the unfinished tail
+        if '\n' not in chunk['content']:
+            continue
+        *lines, buffer = buffer.split('\n')
+        for event in section_events(lines):
+            yield event
+    
+    for event in section_events([buffer]):
+        yield event
 
 
 class RAGComponent:
@@ -7,10 +7,20 @@ Modern ML framework components supporting JAX, PyTorch Lightning, and more.
 
 from typing import Dict, Any, Optional, List, Union, Callable
 import asyncio
+import functools
+import importlib.util
+import itertools
+import os
+import pickle
+import queue
+import threading
+from collections import OrderedDict, deque
 from abc import ABC, abstractmethod
 import numpy as np
 from pathlib import Path
 
+import msgspec
+
 from ...orchestration.modern_decorators import async_component, ComponentConfig
 from ...core.logging import get_logger
 from ...core.telemetry import trace_component
@@ -64,21 +74,66 @@ class MLFramework(ABC):
 class JAXFramework(MLFramework):
     """JAX framework integration with JIT compilation and device management."""
     
+    # Batches staged on device ahead of the one being computed
+    PREFETCH_DEPTH = 2
+    # Jitted function sets kept; predict entries hold their model alive
+    JIT_CACHE_SIZE = 8
+    
     def __init__(self):
-        try:
-            import jax
-            import jax.numpy as jnp
-            from jax import jit, grad, vmap
-            import optax
-            self.jax = jax
-            self.jnp = jnp
-            self.jit = jit
-            self.grad = grad
-            self.vmap = vmap
-            self.optax = optax
-        except ImportError:
+        # Check availability without paying for the import until first use
+        self.available = all(
+            importlib.util.find_spec(module) is not None for module in ('jax', 'optax')
+        )
+        if not self.available:
             logger.warning("JAX not installed. Install with: pip install jax jaxlib optax")
-            self.jax = None
+        
+        # Jitted functions reused across train()/predict() calls, oldest first
+        self._jit_cache: OrderedDict = OrderedDict()
+    
+    @functools.cached_property
+    def jax(self):
+        import jax
+        
+        # Persist compiled XLA executables across processes, unless the
+        # application (or JAX_COMPILATION_CACHE_DIR) already chose a directory
+        if not jax.config.jax_compilation_cache_dir:
+            jax.config.update(
+                "jax_compilation_cache_dir",
+                os.getenv('TWINGRAPH_JAX_CACHE_DIR', os.path.expanduser('~/.cache/twingraph/jax_xla'))
+            )
+        return jax
+    
+    @functools.cached_property
+    def jnp(self):
+        return self.jax.numpy
+    
+    @functools.cached_property
+    def optax(self):
+        import optax
+        return optax
+    
+    @property
+    def jit(self):
+        return self.jax.jit
+    
+    def _cached_jit(self, key: tuple) -> Any:
+        entry = self._jit_cache.get(key)
+        if entry is not None:
+            self._jit_cache.move_to_end(key)
+        return entry
+    
+    def _store_jit(self, key: tuple, entry: Any) -> None:
+        self._jit_cache[key] = entry
+        if len(self._jit_cache) > self.JIT_CACHE_SIZE:
+            self._jit_cache.popitem(last=False)
+    
+    @property
+    def grad(self):
+        return self.jax.grad
+    
+    @property
+    def vmap(self):
+        return self.jax.vmap
     
     async def train(
         self,
@@ -88,7 +143,7 @@ class JAXFramework(MLFramework):
         config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Train JAX model with JIT compilation."""
-        if not self.jax:
+        if not self.available:
             raise RuntimeError("JAX not available")
         
         # Extract config
@@ -96,32 +151,42 @@ class JAXFramework(MLFramework):
         epochs = config.get('epochs', 10)
         batch_size = config.get('batch_size', 32)
         
-        # Initialize optimizer
-        optimizer = self.optax.adam(learning_rate)
-        opt_state = optimizer.init(model)
+        # Initialize optimizer, reusing the compiled epoch for this rate
+        cached = self._cached_jit(('train', learning_rate))
+        optimizer, scan_epoch = cached or self._compile_train(learning_rate)
+        batches, remainder = stack_batches(train_data, batch_size)
         
-        # JIT compile training step
-        @self.jit
-        def train_step(params, opt_state, batch):
-            loss, grads = self.jax.value_and_grad(
-                lambda p: compute_loss(p, batch)
-            )(params)
-            updates, opt_state = optimizer.update(grads, opt_state)
-            params = self.optax.apply_updates(params, updates)
-            return params, opt_state, loss
+        # Keep parameters replicated and batches sharded across devices;
+        # params are copied first because the epoch function donates them
+        replicated, data_sharding = self._shardings(batch_size)
+        model = self.jax.device_put(
+            self.jax.tree_util.tree_map(self.jnp.array, model), replicated
+        )
+        opt_state = self.jax.device_put(optimizer.init(model), replicated)
+        batches = self.jax.device_put(batches, data_sharding)
+        if remainder is not None:
+            remainder = self.jax.device_put(remainder, replicated)
         
         # Training loop
         train_losses = []
         val_losses = []
         
         for epoch in range(epochs):
-            # Train epoch
+            # Train epoch; a dataset shorter than one batch skips the empty
+            # scan rather than compiling it
             epoch_loss = 0.0
-            for batch in get_batches(train_data, batch_size):
-                model, opt_state, loss = train_step(model, opt_state, batch)
-                epoch_loss += loss
+            if len(batches):
+                model, opt_state, epoch_loss = scan_epoch(
+                    model, opt_state, epoch_loss, batches
+                )
+            if remainder is not None:
+                # A short final batch has its own shape, compiled once
+                model, opt_state, epoch_loss = scan_epoch(
+                    model, opt_state, epoch_loss, remainder[None]
+                )
             
-            train_losses.append(float(epoch_loss))
+            epoch_loss = float(epoch_loss)
+            train_losses.append(epoch_loss)
             
             # Validation
             val_loss = await self._validate(model, val_data)
@@ -136,6 +201,49 @@ class JAXFramework(MLFramework):
             'final_loss': val_losses[-1]
         }
     
+    def _compile_train(self, learning_rate: float) -> tuple:
+        """Build the optimizer and jitted epoch function for a learning rate."""
+        optimizer = self.optax.adam(learning_rate)
+        
+        def scan_step(carry, batch):
+            params, opt_state, loss_sum = carry
+            loss, grads = self.jax.value_and_grad(
+                lambda p: compute_loss(p, batch)
+            )(params)
+            updates, opt_state = optimizer.update(grads, opt_state)
+            params = self.optax.apply_updates(params, updates)
+            return (params, opt_state, loss_sum + loss), None
+        
+        # JIT compile a whole epoch; losses stay on device until it ends and
+        # the old params/opt_state buffers are reused for the new ones
+        @functools.partial(self.jit, donate_argnums=(0, 1))
+        def scan_epoch(params, opt_state, loss_sum, batches):
+            carry, _ = self.jax.lax.scan(
+                scan_step, (params, opt_state, loss_sum), batches
+            )
+            return carry
+        
+        # jit keeps its own per-shape executables, so one entry per rate
+        self._store_jit(('train', learning_rate), (optimizer, scan_epoch))
+        return optimizer, scan_epoch
+    
+    def _shardings(self, batch_size: int) -> tuple:
+        """Replicated and batch-sharded placements over a 1-D device mesh."""
+        from jax.experimental import mesh_utils
+        from jax.sharding import Mesh, NamedSharding, PartitionSpec
+        
+        devices = self.jax.devices()
+        mesh = Mesh(mesh_utils.create_device_mesh((len(devices),), devices), ('data',))
+        replicated = NamedSharding(mesh, PartitionSpec())
+        if batch_size % len(devices):
+            logger.warning(
+                f"batch_size {batch_size} not divisible by {len(devices)} devices; "
+                "replicating batches"
+            )
+            return replicated, replicated
+        # Stacked batches are (num_batches, batch_size, ...): split axis 1
+        return replicated, NamedSharding(mesh, PartitionSpec(None, 'data'))
+    
     async def predict(
         self,
         model: Any,
@@ -143,39 +251,90 @@ class JAXFramework(MLFramework):
         config: Dict[str, Any]
     ) -> Any:
         """Run JAX inference with optional batching."""
-        if not self.jax:
+        if not self.available:
             raise RuntimeError("JAX not available")
         
-        # JIT compile prediction
-        predict_fn = self.jit(lambda params, x: model.apply(params, x))
+        # JIT compile prediction once per model; the cached entry keeps the
+        # model alive so its id can't be reused by another object, and the
+        # LRU bound releases models that are no longer used
+        cached = self._cached_jit(('predict', id(model)))
+        if cached is None:
+            def predict_batches(params, batches):
+                return self.jax.lax.map(lambda x: model.apply(params, x), batches)
+            
+            cached = (
+                model,
+                self.jit(lambda params, x: model.apply(params, x)),
+                self.jit(predict_batches)
+            )
+            self._store_jit(('predict', id(model)), cached)
+        _, predict_fn, predict_batches = cached
+        
+        # An iterator of batches (no len) is streamed through the device
+        if not hasattr(data, '__len__'):
+            return self._predict_stream(predict_fn, model, data)
         
         # Handle batching
         if config.get('batch_inference', True):
             batch_size = config.get('batch_size', 32)
-            predictions = []
-            
-            for batch in get_batches(data, batch_size):
-                batch_pred = predict_fn(model, batch)
-                predictions.append(batch_pred)
+            batches, remainder = stack_batches(data, batch_size)
             
-            return self.jnp.concatenate(predictions)
+            # One dispatch maps over all full batches on device
+            predictions = predict_batches(model, batches)
+            predictions = predictions.reshape((-1,) + predictions.shape[2:])
+            if remainder is not None:
+                predictions = self.jnp.concatenate(
+                    [predictions, predict_fn(model, remainder)]
+                )
+            return predictions
         else:
             return predict_fn(model, data)
     
-    async def save_model(self, model: Any, path: Path) -> None:
-        """Save JAX model using pickle."""
-        import pickle
+    def _predict_stream(self, predict_fn: Callable, params: Any, batches: Any) -> Any:
+        """Predict over streamed batches, copying ahead while computing."""
+        batches = iter(batches)
+        # device_put is asynchronous, so the next batches transfer while the
+        # current one computes; each leaves device memory once consumed
+        window = deque(
+            self.jax.device_put(batch)
+            for batch in itertools.islice(batches, self.PREFETCH_DEPTH)
+        )
+        predictions = []
+        while window:
+            batch = window.popleft()
+            window.extend(self.jax.device_put(b) for b in itertools.islice(batches, 1))
+            predictions.append(predict_fn(params, batch))
         
+        if not predictions:
+            return self.jnp.zeros((0,))
+        return self.jax.block_until_ready(self.jnp.concatenate(predictions))
+    
+    # Header marking msgpack checkpoints; older checkpoints are pickles
+    CHECKPOINT_MAGIC = b'TGJAX1\n'
+    
+    async def save_model(self, model: Any, path: Path) -> None:
+        """Save JAX parameters as a msgpack checkpoint."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'wb') as f:
-            pickle.dump(model, f)
+        leaves, treedef = self.jax.tree_util.tree_flatten(model)
+        # Leaves go to msgpack; the treedef keeps tuples, namedtuples and
+        # custom nodes (e.g. FrozenDict), which only JAX's pickle support covers
+        payload = msgspec.msgpack.encode(
+            {'treedef': pickle.dumps(treedef), 'leaves': leaves},
+            enc_hook=_encode_array
+        )
+        path.write_bytes(self.CHECKPOINT_MAGIC + payload)
     
     async def load_model(self, path: Path, config: Dict[str, Any]) -> Any:
         """Load JAX model."""
-        import pickle
+        data = path.read_bytes()
+        if not data.startswith(self.CHECKPOINT_MAGIC):
+            logger.warning(f"Loading legacy pickle checkpoint {path}; re-save to convert it")
+            return pickle.loads(data)
         
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+        payload = memoryview(data)[len(self.CHECKPOINT_MAGIC):]
+        checkpoint = msgspec.msgpack.decode(payload)
+        leaves = [_decode_array(leaf) for leaf in checkpoint['leaves']]
+        return self.jax.tree_util.tree_unflatten(pickle.loads(checkpoint['treedef']), leaves)
     
     async def _validate(self, model: Any, val_data: Any) -> float:
         """Validate model on validation set."""
@@ -187,24 +346,38 @@ class PyTorchLightningFramework(MLFramework):
     """PyTorch Lightning integration with advanced features."""
     
     def __init__(self):
-        try:
-            import torch
-            import pytorch_lightning as pl
-            from pytorch_lightning.callbacks import (
-                ModelCheckpoint, EarlyStopping, LearningRateMonitor
-            )
-            from pytorch_lightning.loggers import TensorBoardLogger
-            self.torch = torch
-            self.pl = pl
-            self.callbacks = {
-                'checkpoint': ModelCheckpoint,
-                'early_stopping': EarlyStopping,
-                'lr_monitor': LearningRateMonitor
-            }
-            self.TensorBoardLogger = TensorBoardLogger
-        except ImportError:
+        self.available = all(
+            importlib.util.find_spec(module) is not None
+            for module in ('torch', 'pytorch_lightning')
+        )
+        if not self.available:
             logger.warning("PyTorch Lightning not installed. Install with: pip install pytorch-lightning")
-            self.pl = None
+    
+    @functools.cached_property
+    def torch(self):
+        import torch
+        return torch
+    
+    @functools.cached_property
+    def pl(self):
+        import pytorch_lightning as pl
+        return pl
+    
+    @functools.cached_property
+    def callbacks(self) -> Dict[str, Any]:
+        from pytorch_lightning.callbacks import (
+            ModelCheckpoint, EarlyStopping, LearningRateMonitor
+        )
+        return {
+            'checkpoint': ModelCheckpoint,
+            'early_stopping': EarlyStopping,
+            'lr_monitor': LearningRateMonitor
+        }
+    
+    @functools.cached_property
+    def TensorBoardLogger(self):
+        from pytorch_lightning.loggers import TensorBoardLogger
+        return TensorBoardLogger
     
     async def train(
         self,
@@ -213,10 +386,20 @@ class PyTorchLightningFramework(MLFramework):
         val_data: Any,
         config: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Train PyTorch Lightning model with callbacks."""
-        if not self.pl:
+        """Train PyTorch Lightning model with callbacks.
+        
+        Precision defaults to 'bf16-mixed' on GPUs that support bf16,
+        '16-mixed' on other GPUs and 32 on CPU; pass config['precision']
+        to override.
+        """
+        if not self.available:
             raise RuntimeError("PyTorch Lightning not available")
         
+        precision = config.get('precision') or self._default_precision()
+        if str(precision) in ('32', '32-true'):
+            # Let fp32 matmuls use TF32 tensor cores where available
+            self.torch.set_float32_matmul_precision('high')
+        
         # Setup callbacks
         callbacks = []
         
@@ -249,17 +432,24 @@ class PyTorchLightningFramework(MLFramework):
                 name=config.get('experiment_name', 'twingraph_experiment')
             )
         
+        # Multi-GPU runs use ddp; ddp_spawn re-pickles everything per process
+        devices = config.get('devices', 'auto')
+        strategy = config.get('strategy') or (
+            'ddp' if isinstance(devices, int) and devices > 1 else 'auto'
+        )
+        
         # Create trainer
         trainer = self.pl.Trainer(
             max_epochs=config.get('epochs', 10),
             accelerator=config.get('accelerator', 'auto'),
-            devices=config.get('devices', 'auto'),
+            devices=devices,
+            strategy=strategy,
             callbacks=callbacks,
             logger=logger,
             enable_progress_bar=config.get('progress_bar', True),
             gradient_clip_val=config.get('gradient_clip', 1.0),
             accumulate_grad_batches=config.get('accumulate_grad_batches', 1),
-            precision=config.get('precision', 32),
+            precision=precision,
         )
         
         # Train model
@@ -273,16 +463,30 @@ class PyTorchLightningFramework(MLFramework):
             'metrics': trainer.logged_metrics
         }
     
+    def _default_precision(self) -> Union[str, int]:
+        """Fastest mixed precision the local GPU supports."""
+        cuda = self.torch.cuda
+        if not cuda.is_available():
+            return 32
+        return 'bf16-mixed' if cuda.is_bf16_supported() else '16-mixed'
+    
     async def predict(
         self,
         model: Any,
         data: Any,
         config: Dict[str, Any]
     ) -> Any:
-        """Run PyTorch Lightning inference."""
-        if not self.pl:
+        """Run PyTorch Lightning inference.
+        
+        With config['fast_predict'] on a CUDA machine, the Trainer is skipped
+        for a plain inference loop that prefetches batches to the GPU.
+        """
+        if not self.available:
             raise RuntimeError("PyTorch Lightning not available")
         
+        if config.get('fast_predict') and self.torch.cuda.is_available():
+            return self._fast_predict(model, data)
+        
         trainer = self.pl.Trainer(
             accelerator=config.get('accelerator', 'auto'),
             devices=config.get('devices', 'auto'),
@@ -295,6 +499,15 @@ class PyTorchLightningFramework(MLFramework):
             return self.torch.cat(predictions)
         return predictions
     
+    def _fast_predict(self, model: Any, data: Any) -> Any:
+        """Predict on the GPU, copying batch N+1 while batch N runs."""
+        model = model.to('cuda').eval()
+        predictions = []
+        with self.torch.inference_mode():
+            for batch_idx, batch in enumerate(CUDAPrefetcher(data)):
+                predictions.append(model.predict_step(batch, batch_idx))
+        return self.torch.cat(predictions)
+    
     async def save_model(self, model: Any, path: Path) -> None:
         """Save PyTorch Lightning model."""
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -311,28 +524,85 @@ class PyTorchLightningFramework(MLFramework):
         return model
 
 
+class CUDAPrefetcher:
+    """
+    Iterate a data loader with the next batch already on the GPU.
+    
+    Each batch is copied with non_blocking=True on a side CUDA stream while
+    the caller works on the previous one. Use a loader with pin_memory=True,
+    otherwise the copies are synchronous.
+    """
+    
+    def __init__(self, loader: Any, device: str = 'cuda'):
+        import torch
+        self.torch = torch
+        self.loader = iter(loader)
+        self.device = device
+        self.stream = torch.cuda.Stream()
+        self._preload()
+    
+    def _preload(self):
+        try:
+            batch = next(self.loader)
+        except StopIteration:
+            self.batch = None
+            return
+        with self.torch.cuda.stream(self.stream):
+            self.batch = _map_tensors(
+                lambda t: t.to(self.device, non_blocking=True), batch
+            )
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> Any:
+        current = self.torch.cuda.current_stream()
+        current.wait_stream(self.stream)
+        batch = self.batch
+        if batch is None:
+            raise StopIteration
+        # The batch was allocated on the side stream but is used on this one
+        _map_tensors(lambda t: t.record_stream(current), batch)
+        self._preload()
+        return batch
+
+
 class HuggingFaceFramework(MLFramework):
     """Hugging Face Transformers integration."""
     
     def __init__(self):
-        try:
-            from transformers import (
-                AutoModel, AutoTokenizer, AutoModelForSequenceClassification,
-                Trainer, TrainingArguments, pipeline
-            )
-            import datasets
-            self.transformers = {
-                'AutoModel': AutoModel,
-                'AutoTokenizer': AutoTokenizer,
-                'AutoModelForSequenceClassification': AutoModelForSequenceClassification,
-                'Trainer': Trainer,
-                'TrainingArguments': TrainingArguments,
-                'pipeline': pipeline
-            }
-            self.datasets = datasets
-        except ImportError:
+        self.available = all(
+            importlib.util.find_spec(module) is not None
+            for module in ('transformers', 'datasets')
+        )
+        if not self.available:
             logger.warning("Transformers not installed. Install with: pip install transformers datasets")
-            self.transformers = None
+    
+    @functools.cached_property
+    def transformers(self) -> Dict[str, Any]:
+        from transformers import (
+            AutoModel, AutoTokenizer, AutoModelForSequenceClassification,
+            DataCollatorWithPadding, Trainer, TrainingArguments, pipeline
+        )
+        return {
+            'AutoModel': AutoModel,
+            'AutoTokenizer': AutoTokenizer,
+            'AutoModelForSequenceClassification': AutoModelForSequenceClassification,
+            'DataCollatorWithPadding': DataCollatorWithPadding,
+            'Trainer': Trainer,
+            'TrainingArguments': TrainingArguments,
+            'pipeline': pipeline
+        }
+    
+    @functools.cached_property
+    def datasets(self):
+        import datasets
+        return datasets
+    
+    @functools.cached_property
+    def torch(self):
+        import torch
+        return torch
     
     async def train(
         self,
@@ -342,9 +612,13 @@ class HuggingFaceFramework(MLFramework):
         config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Train Hugging Face model."""
-        if not self.transformers:
+        if not self.available:
             raise RuntimeError("Transformers not available")
         
+        # Mixed precision, TF32 and fused AdamW need a (recent) CUDA device
+        cuda = self.torch.cuda.is_available()
+        ampere = cuda and self.torch.cuda.get_device_capability()[0] >= 8
+        
         # Training arguments
         training_args = self.transformers['TrainingArguments'](
             output_dir=config.get('output_dir', './results'),
@@ -359,6 +633,14 @@ class HuggingFaceFramework(MLFramework):
             load_best_model_at_end=True,
             metric_for_best_model=config.get('metric', 'eval_loss'),
             push_to_hub=config.get('push_to_hub', False),
+            bf16=config.get('bf16', cuda and self.torch.cuda.is_bf16_supported()),
+            tf32=config.get('tf32', ampere),
+            torch_compile=config.get('torch_compile', True),
+            gradient_checkpointing=config.get('grad_ckpt', False),
+            optim=config.get('optim', 'adamw_torch_fused' if cuda else 'adamw_torch'),
+            dataloader_num_workers=config.get('num_workers', 4),
+            dataloader_pin_memory=cuda,
+            group_by_length=config.get('group_by_length', True),
         )
         
         # Create trainer
@@ -368,6 +650,7 @@ class HuggingFaceFramework(MLFramework):
             train_dataset=train_data,
             eval_dataset=val_data,
             compute_metrics=config.get('compute_metrics'),
+            data_collator=config.get('data_collator'),
         )
         
         # Train
@@ -390,7 +673,7 @@ class HuggingFaceFramework(MLFramework):
         config: Dict[str, Any]
     ) -> Any:
         """Run Hugging Face inference."""
-        if not self.transformers:
+        if not self.available:
             raise RuntimeError("Transformers not available")
         
         # Use pipeline for easy inference
@@ -454,7 +737,7 @@ async def jax_training(
     # Save model
     await framework.save_model(
         result['model'],
-        Path(f"models/jax_model_{datetime.now().isoformat()}.pkl")
+        Path(f"models/jax_model_{datetime.now().isoformat()}.msgpack")
     )
     
     return result
@@ -480,7 +763,7 @@ async def lightning_training(
         result = await lightning_training(
             model_class='ResNet50',
             data_module=ImageDataModule(batch_size=64),
-            config={'epochs': 50, 'devices': 2}
+            config={'epochs': 50, 'devices': 2, 'num_workers': 'auto'}
         )
     """
     framework = PyTorchLightningFramework()
@@ -491,8 +774,8 @@ async def lightning_training(
     # Train
     result = await framework.train(
         model,
-        data_module.train_dataloader(),
-        data_module.val_dataloader(),
+        tune_dataloader(data_module.train_dataloader(), config),
+        tune_dataloader(data_module.val_dataloader(), config),
         config
     )
     
@@ -530,29 +813,199 @@ async def finetune_llm(
     # Load dataset
     dataset = framework.datasets.load_dataset(dataset_name)
     
-    # Tokenize dataset
+    # Tokenize dataset across all cores; padding is left to the collator
+    # so each training batch is padded only to its own longest sequence
     def tokenize_function(examples):
-        return tokenizer(examples['text'], padding=True, truncation=True)
+        return tokenizer(
+            examples['text'],
+            padding=False,
+            truncation=True,
+            max_length=training_config.get('max_length', 512)
+        )
+    
+    tokenized_dataset = dataset.map(
+        tokenize_function,
+        batched=True,
+        batch_size=1000,
+        num_proc=os.cpu_count(),
+        remove_columns=[
+            column for column in dataset['train'].column_names if column != 'label'
+        ]
+    )
     
-    tokenized_dataset = dataset.map(tokenize_function, batched=True)
+    # Pad to multiples of 8 to line up with tensor-core tiles
+    collator = framework.transformers['DataCollatorWithPadding'](
+        tokenizer, pad_to_multiple_of=8
+    )
     
     # Train
     result = await framework.train(
         model,
         tokenized_dataset['train'],
         tokenized_dataset['validation'],
-        training_config
+        {'data_collator': collator, **training_config}
     )
     
     return result
 
 
 # Helper functions
-def get_batches(data: Any, batch_size: int):
-    """Generate batches from data."""
-    # Simplified batching - would be more complex in practice
-    for i in range(0, len(data), batch_size):
-        yield data[i:i + batch_size]
+def _encode_array(obj: Any) -> Any:
+    """msgpack hook storing numpy/JAX arrays as raw buffers."""
+    if hasattr(obj, '__array__'):
+        array = np.asarray(obj, order='C')
+        return {
+            '__ndarray__': True,
+            'shape': array.shape,
+            'dtype': array.dtype.name,
+            'buf': array.tobytes()
+        }
+    raise NotImplementedError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _decode_array(obj: Any) -> Any:
+    """Rebuild a checkpoint leaf, copying array buffers so they are writable."""
+    if isinstance(obj, dict) and obj.get('__ndarray__'):
+        buf = bytearray(obj['buf'])
+        return np.frombuffer(buf, dtype=_resolve_dtype(obj['dtype'])).reshape(obj['shape'])
+    return obj
+
+
+def _resolve_dtype(name: str) -> np.dtype:
+    """Resolve a dtype name, including the ml_dtypes types JAX uses (bfloat16, float8_*)."""
+    try:
+        return np.dtype(name)
+    except TypeError:
+        import ml_dtypes
+        
+        return np.dtype(getattr(ml_dtypes, name))
+
+
+def _map_tensors(fn: Callable, batch: Any) -> Any:
+    """Apply fn to every tensor in a (possibly nested) batch."""
+    if hasattr(batch, 'record_stream'):
+        return fn(batch)
+    if isinstance(batch, dict):
+        return {key: _map_tensors(fn, value) for key, value in batch.items()}
+    if isinstance(batch, (list, tuple)):
+        return type(batch)(_map_tensors(fn, value) for value in batch)
+    return batch
+
+
+def tune_dataloader(loader: Any, config: Dict[str, Any]) -> Any:
+    """
+    Rebuild a torch DataLoader with worker, pinning and prefetch settings.
+    
+    The loader's own settings are kept; config keys num_workers,
+    pin_memory, persistent_workers, prefetch_factor and timeout override
+    them when present. num_workers='auto' uses the CPUs per device.
+    """
+    from torch.utils.data import DataLoader
+    
+    options = {
+        'num_workers': loader.num_workers,
+        'pin_memory': loader.pin_memory,
+        'persistent_workers': loader.persistent_workers,
+        'prefetch_factor': loader.prefetch_factor,
+        'timeout': loader.timeout,
+        'worker_init_fn': loader.worker_init_fn,
+        'generator': loader.generator,
+        'multiprocessing_context': loader.multiprocessing_context
+    }
+    options.update(
+        (key, config[key]) for key in
+        ('num_workers', 'pin_memory', 'persistent_workers', 'prefetch_factor', 'timeout')
+        if key in config
+    )
+    
+    if options['num_workers'] == 'auto':
+        devices = config.get('devices')
+        per_device = devices if isinstance(devices, int) and devices > 0 else 1
+        options['num_workers'] = (os.cpu_count() or 1) // per_device
+    if options['num_workers'] == 0:
+        # Both are rejected without worker processes
+        options['persistent_workers'] = False
+        options['prefetch_factor'] = None
+    
+    if loader.batch_size is None and loader.batch_sampler is not None:
+        # Custom batch sampler; batch_size/sampler/drop_last must stay unset
+        options['batch_sampler'] = loader.batch_sampler
+    else:
+        options.update(
+            batch_size=loader.batch_size,
+            sampler=loader.sampler,
+            drop_last=loader.drop_last
+        )
+    
+    return DataLoader(loader.dataset, collate_fn=loader.collate_fn, **options)
+
+
+class PrefetchGenerator(threading.Thread):
+    """Run a generator in a background thread, keeping a few items ready."""
+    
+    _DONE = object()
+    
+    def __init__(self, generator: Any, num_prefetch_queue: int = 4):
+        super().__init__(daemon=True)
+        self.queue: queue.Queue = queue.Queue(num_prefetch_queue)
+        self.generator = generator
+        self.start()
+    
+    def run(self):
+        try:
+            for item in self.generator:
+                self.queue.put((item, None))
+        except Exception as e:
+            self.queue.put((None, e))
+        finally:
+            self.queue.put((self._DONE, None))
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> Any:
+        item, error = self.queue.get()
+        if error is not None:
+            raise error
+        if item is self._DONE:
+            raise StopIteration
+        return item
+
+
+def get_batches(data: Any, batch_size: int, num_prefetch: int = 4):
+    """
+    Generate batches from data.
+    
+    Arrays are split with one reshape into views; other iterables are
+    grouped into lists on a background thread so batching overlaps with
+    the consumer.
+    """
+    if hasattr(data, 'reshape'):
+        batches, remainder = stack_batches(data, batch_size)
+        yield from batches
+        if remainder is not None:
+            yield remainder
+        return
+    
+    def group():
+        iterator = iter(data)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            yield batch
+    
+    yield from PrefetchGenerator(group(), num_prefetch)
+
+
+def stack_batches(data: Any, batch_size: int) -> tuple:
+    """Split data into a (num_batches, batch_size, ...) array and a short remainder."""
+    if not hasattr(data, 'reshape'):
+        # Device arrays (JAX) already reshape in place; only convert the rest
+        data = np.asarray(data)
+    num_full = len(data) // batch_size
+    stacked = data[:num_full * batch_size].reshape(
+        (num_full, batch_size) + data.shape[1:]
+    )
+    remainder = data[num_full * batch_size:]
+    return stacked, remainder if len(remainder) else None
 
 
 def compute_loss(params: Any, batch: Any) -> float:
@@ -587,8 +1040,10 @@ __all__ = [
     'MLFramework',
     'JAXFramework',
     'PyTorchLightningFramework',
+    'CUDAPrefetcher',
     'HuggingFaceFramework',
     'jax_training',
     'lightning_training',
-    'finetune_llm'
+    'finetune_llm',
+    'tune_dataloader'
 ]
\ No newline at end of file
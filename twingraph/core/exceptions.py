@@ -23,12 +23,13 @@ class TwinGraphError(Exception):
         self.cause = cause
     
     def __str__(self):
-        base_msg = self.message
+        # Built on use; many exceptions are caught without being printed
+        parts = [self.message]
         if self.details:
-            base_msg += f" | Details: {self.details}"
+            parts.append(f" | Details: {self.details}")
         if self.cause:
-            base_msg += f" | Caused by: {type(self.cause).__name__}: {str(self.cause)}"
-        return base_msg
+            parts.append(f" | Caused by: {type(self.cause).__name__}: {self.cause}")
+        return ''.join(parts)
 
 
 class ComponentError(TwinGraphError):
@@ -50,9 +51,9 @@ class ComponentExecutionError(ComponentError):
         details = {
             'component_name': component_name,
             'execution_id': execution_id,
-            'platform': platform
+            'platform': platform,
+            **kwargs
         }
-        details.update(kwargs)
         super().__init__(message, details)
 
 
@@ -80,9 +81,9 @@ class PipelineExecutionError(PipelineError):
         details = {
             'pipeline_name': pipeline_name,
             'pipeline_id': pipeline_id,
-            'failed_component': failed_component
+            'failed_component': failed_component,
+            **kwargs
         }
-        details.update(kwargs)
         super().__init__(message, details)
 
 
@@ -138,9 +139,9 @@ class RetryableError(TwinGraphError):
     ):
         details = {
             'retry_after': retry_after,
-            'max_retries': max_retries
+            'max_retries': max_retries,
+            **kwargs
         }
-        details.update(kwargs)
         super().__init__(message, details)
 
 
@@ -166,7 +167,7 @@ class TimeoutError(TwinGraphError):
     ):
         details = {
             'timeout': timeout,
-            'operation': operation
+            'operation': operation,
+            **kwargs
         }
-        details.update(kwargs)
         super().__init__(message, details)
\ No newline at end of file
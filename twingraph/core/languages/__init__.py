@@ -2,33 +2,175 @@
 # Copyright (c) 2025 TwinGraph Contributors
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
+import base64
+import functools
+import hashlib
+import multiprocessing
+import shutil
 import subprocess
-import json
+import sys
 import tempfile
 import os
 
+import msgspec
+
+# Children are started with close_fds=False and an absolute executable path so
+# subprocess can use posix_spawn (vfork-style on glibc >= 2.24) instead of
+# fork+exec, which copies the page tables of a large parent. Python creates
+# descriptors non-inheritable (PEP 446), so nothing leaks into the child.
+_SPAWN_KWARGS = {'close_fds': False}
+
+@functools.lru_cache(maxsize=None)
+def _executable(name: str) -> str:
+    return shutil.which(name) or name
+
+# Scripts under this size go straight on the command line (python -c /
+# node -e). Linux caps a single argv string at 128 KiB (MAX_ARG_STRLEN), and
+# the whole argv+environ block at ARG_MAX, so stay well inside both.
+try:
+    _INLINE_SCRIPT_LIMIT = min(128 * 1024, os.sysconf('SC_ARG_MAX') // 4)
+except (AttributeError, ValueError, OSError):
+    _INLINE_SCRIPT_LIMIT = 32 * 1024
+
 class LanguageExecutor(ABC):
     """Base class for language-specific code executors"""
     
+    def __init__(self):
+        # Larger scripts are written to tmpfs when available
+        self._script_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    
+    def _script_args(self, inline_flag: str, script: str, suffix: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Interpreter arguments for running script, plus the temp file to
+        remove afterwards (None when the script is passed inline).
+        """
+        if '\0' not in script and len(script.encode()) < _INLINE_SCRIPT_LIMIT:
+            return [inline_flag, script], None
+        with tempfile.NamedTemporaryFile(
+            mode='w', suffix=suffix, dir=self._script_dir, delete=False
+        ) as f:
+            f.write(script)
+        return [f.name], f.name
+    
+    def _child_env(self, config: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Environment for a child process; None inherits ours unchanged."""
+        environment = config.get('environment')
+        # Merged at call time so later changes to os.environ are seen
+        return {**os.environ, **environment} if environment else None
+    
     @abstractmethod
     async def execute(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute code with given inputs and return outputs"""
         pass
 
+def _b64_msgpack(value: Any) -> str:
+    """Encode a value for embedding in generated source."""
+    return base64.b64encode(msgspec.msgpack.encode(value)).decode()
+
+def _read_fd(fd: int) -> bytes:
+    with os.fdopen(fd, 'rb') as f:
+        return f.read()
+
+def _warm_worker():
+    """Import common libraries once per pool worker."""
+    for module in ('numpy', 'pandas'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+@functools.lru_cache(maxsize=256)
+def _compile_user_code(code: str, filename: str = '<user>'):
+    # Workers outlive calls, so a component that runs repeatedly is
+    # compiled once per worker (code objects can't be pickled across)
+    return compile(code, filename, 'exec')
+
+def _run_python(code: str, inputs: Dict[str, Any], environment: Dict[str, str],
+                filename: str = '<user>') -> Dict[str, Any]:
+    """Run user code inside a pool worker and call its process function."""
+    saved = {key: os.environ.get(key) for key in environment}
+    os.environ.update(environment)
+    try:
+        namespace = {'__name__': '__twingraph__', 'inputs': inputs}
+        exec(_compile_user_code(code, filename), namespace)
+        if 'process' in namespace:
+            return namespace['process'](inputs)
+        return {"error": "No process function found"}
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
 class PythonExecutor(LanguageExecutor):
+    """
+    Runs trusted Python code in a pool of warm worker processes.
+    
+    Compiled code is cached per worker and inputs/outputs travel as pickles.
+    Set config['isolated'] to run each call in a fresh interpreter instead;
+    use that for untrusted or long-running code, since a pooled call that
+    times out keeps its worker busy until it finishes.
+    
+    Workers are started by a fork server (spawn where unavailable), never
+    forked from this threaded process, so scripts that use the pool need
+    an ``if __name__ == '__main__':`` guard.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__()
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Started on first use so constructing an executor stays cheap
+        if self._pool is None:
+            # Forking a process with live threads (event loop executors,
+            # telemetry exporters) can copy locks held mid-operation
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_warm_worker,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return self._pool
+    
     async def execute(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute Python code"""
-        # Create a temporary Python file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            # Prepare the execution environment
-            exec_code = f"""
-import json
+        if config.get('isolated', False):
+            return await self._execute_isolated(code, inputs, config)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_pool(), _run_python, code, inputs, config.get('environment', {}),
+            f"<node:{config['node_id']}>" if 'node_id' in config else '<user>'
+        )
+        try:
+            return await asyncio.wait_for(future, timeout=config.get('timeout', 30))
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Python execution failed: {e}") from e
+    
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    async def _execute_isolated(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute Python code in a fresh interpreter"""
+        # Prepare the execution environment; the result goes back as
+        # msgpack on a dedicated pipe so user prints can't corrupt it
+        exec_code = f"""
+import base64
+import os
 import sys
+import msgspec
 
 # Load inputs
-inputs = {json.dumps(inputs)}
+inputs = msgspec.msgpack.decode(base64.b64decode("{_b64_msgpack(inputs)}"))
 
 # User code
 {code}
@@ -36,51 +178,71 @@ inputs = {json.dumps(inputs)}
 # Call process function if it exists
 if 'process' in locals():
     result = process(inputs)
-    print(json.dumps(result))
 else:
-    print(json.dumps({{"error": "No process function found"}}))
+    result = {{"error": "No process function found"}}
+with os.fdopen(int(sys.argv[1]), 'wb') as result_pipe:
+    result_pipe.write(msgspec.msgpack.encode(result))
 """
-            f.write(exec_code)
-            temp_file = f.name
+        script_args, temp_file = self._script_args('-c', exec_code, '.py')
         
+        read_fd, write_fd = os.pipe()
         try:
             # Execute the code
-            process = await asyncio.create_subprocess_exec(
-                'python', temp_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env={**os.environ, **config.get('environment', {})}
-            )
+            try:
+                # Same interpreter (and virtualenv) as ours, so msgspec and the
+                # user's dependencies are importable
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, *script_args, str(write_fd),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self._child_env(config),
+                    pass_fds=(write_fd,)
+                )
+            finally:
+                os.close(write_fd)
+            result = asyncio.ensure_future(asyncio.to_thread(_read_fd, read_fd))
             
             # Wait for completion with timeout
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=config.get('timeout', 30)
-            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=config.get('timeout', 30)
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                raise
             
             if process.returncode != 0:
                 raise RuntimeError(f"Python execution failed: {stderr.decode()}")
             
             # Parse output
-            return json.loads(stdout.decode())
+            return msgspec.msgpack.decode(await result)
             
         finally:
-            os.unlink(temp_file)
+            if temp_file:
+                os.unlink(temp_file)
 
 class BashExecutor(LanguageExecutor):
+    """
+    Runs Bash code with inputs exposed as INPUT_<NAME> environment variables.
+    
+    Strings and numbers are passed as-is (booleans as true/false); lists
+    and dicts are JSON-encoded.
+    """
+    
     async def execute(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute Bash code"""
         # Create environment with inputs
-        env = os.environ.copy()
-        env.update(config.get('environment', {}))
+        env = {**os.environ, **config.get('environment', {})}
         
         # Add inputs as environment variables
         for key, value in inputs.items():
-            env[f"INPUT_{key.upper()}"] = json.dumps(value)
+            env[f"INPUT_{key.upper()}"] = _env_value(value)
         
         # Execute the bash script
         process = await asyncio.create_subprocess_shell(
             code,
+            **_SPAWN_KWARGS,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             env=env
@@ -96,19 +258,166 @@ class BashExecutor(LanguageExecutor):
             raise RuntimeError(f"Bash execution failed: {stderr.decode()}")
         
         # Try to parse output as JSON, otherwise return as string
-        output = stdout.decode().strip()
+        output = stdout.strip()
         try:
-            return json.loads(output)
-        except json.JSONDecodeError:
-            return {"output": output}
+            return msgspec.json.decode(output)
+        except msgspec.DecodeError:
+            return {"output": output.decode()}
+
+def _env_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return msgspec.json.encode(value).decode()
+
+# Long-lived Node worker: reads 4-byte big-endian length-prefixed JSON
+# requests on stdin, keeps compiled scripts in an LRU keyed by code hash and
+# answers with length-prefixed JSON on stdout. User console output goes to
+# stderr so it can't corrupt the framing.
+_NODE_WORKER = r"""
+const vm = require('vm');
+const MAX_SCRIPTS = 256;
+const scripts = new Map();
+const log = (...args) => process.stderr.write(args.join(' ') + '\n');
+const userConsole = {log, info: log, warn: log, error: log, debug: log};
+// Node globals a plain `node -e` script can use; vm contexts start without them
+const nodeGlobals = {
+  require, Buffer, URL, URLSearchParams, TextEncoder, TextDecoder,
+  setTimeout, clearTimeout, setInterval, clearInterval,
+  setImmediate, clearImmediate, queueMicrotask,
+};
+
+function getScript(hash, code) {
+  let script = scripts.get(hash);
+  if (script) {
+    scripts.delete(hash);
+  } else if (code == null) {
+    return null;
+  } else {
+    script = new vm.Script(code +
+      "\n;typeof process === 'function' ? process(inputs) : {error: 'No process function found'}");
+  }
+  scripts.set(hash, script);
+  if (scripts.size > MAX_SCRIPTS) scripts.delete(scripts.keys().next().value);
+  return script;
+}
+
+async function handle(request) {
+  let script;
+  try {
+    script = getScript(request.code_hash, request.code);
+  } catch (e) {
+    return {error: String(e && e.stack || e)};
+  }
+  if (!script) return {missing: true};
+  try {
+    const env = {...process.env, ...request.env};
+    const module = {exports: {}};
+    const context = {
+      ...nodeGlobals, module, exports: module.exports,
+      inputs: request.inputs, env, console: userConsole,
+    };
+    return {result: await script.runInNewContext(context)};
+  } catch (e) {
+    return {error: String(e && e.stack || e)};
+  }
+}
+
+function send(message) {
+  const body = Buffer.from(JSON.stringify(message));
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length);
+  process.stdout.write(Buffer.concat([header, body]));
+}
+
+let buffer = Buffer.alloc(0);
+let queue = Promise.resolve();
+process.stdin.on('data', (chunk) => {
+  buffer = Buffer.concat([buffer, chunk]);
+  while (buffer.length >= 4) {
+    const length = buffer.readUInt32BE(0);
+    if (buffer.length < 4 + length) break;
+    const request = JSON.parse(buffer.subarray(4, 4 + length));
+    buffer = buffer.subarray(4 + length);
+    queue = queue.then(() => handle(request)).then(send);
+  }
+});
+"""
+
+class _NodeWorker:
+    """Client for one persistent Node worker process."""
+    
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+    
+    async def _ensure_started(self):
+        if self._process is None or self._process.returncode is not None:
+            self._process = await asyncio.create_subprocess_exec(
+                _executable('node'), '-e', _NODE_WORKER,
+                **_SPAWN_KWARGS,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE
+            )
+    
+    async def _roundtrip(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        payload = msgspec.json.encode(request)
+        self._process.stdin.write(len(payload).to_bytes(4, 'big') + payload)
+        await self._process.stdin.drain()
+        header = await self._process.stdout.readexactly(4)
+        body = await self._process.stdout.readexactly(int.from_bytes(header, 'big'))
+        return msgspec.json.decode(body)
+    
+    async def run(self, code: str, inputs: Dict[str, Any], env: Dict[str, str], timeout: float) -> Any:
+        code_hash = hashlib.sha256(code.encode()).hexdigest()
+        request = {'code_hash': code_hash, 'code': None, 'inputs': inputs, 'env': env}
+        async with self._lock:
+            await self._ensure_started()
+            try:
+                # Send the source only when the worker doesn't have it cached
+                response = await asyncio.wait_for(self._roundtrip(request), timeout)
+                if response.get('missing'):
+                    request['code'] = code
+                    response = await asyncio.wait_for(self._roundtrip(request), timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                # The worker's state is unknown; start a fresh one next time
+                self.close()
+                raise
+        if 'error' in response:
+            raise RuntimeError(f"JavaScript execution failed: {response['error']}")
+        return response['result']
+    
+    def close(self):
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        self._process = None
 
 class JavaScriptExecutor(LanguageExecutor):
+    """
+    Runs JavaScript in a persistent Node worker, compiling each distinct
+    code string once. Code sees the usual Node globals (require, Buffer,
+    timers, module) plus inputs and env. Set config['isolated'] to run
+    each call in a fresh node process instead.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._worker = _NodeWorker()
+    
     async def execute(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute JavaScript code using Node.js"""
-        # Create a temporary JavaScript file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-            exec_code = f"""
-const inputs = {json.dumps(inputs)};
+        if config.get('isolated', False):
+            return await self._execute_isolated(code, inputs, config)
+        return await self._worker.run(
+            code, inputs, config.get('environment', {}),
+            config.get('timeout', 30)
+        )
+    
+    async def _execute_isolated(self, code: str, inputs: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute JavaScript code in a fresh node process"""
+        exec_code = f"""
+const inputs = {msgspec.json.encode(inputs).decode()};
 
 // User code
 {code}
@@ -121,16 +430,16 @@ if (typeof process === 'function') {{
     console.log(JSON.stringify({{error: "No process function found"}}));
 }}
 """
-            f.write(exec_code)
-            temp_file = f.name
+        script_args, temp_file = self._script_args('-e', exec_code, '.js')
         
         try:
             # Execute the code
             process = await asyncio.create_subprocess_exec(
-                'node', temp_file,
+                _executable('node'), *script_args,
+                **_SPAWN_KWARGS,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env={**os.environ, **config.get('environment', {})}
+                env=self._child_env(config)
             )
             
             # Wait for completion with timeout
@@ -143,7 +452,8 @@ if (typeof process === 'function') {{
                 raise RuntimeError(f"JavaScript execution failed: {stderr.decode()}")
             
             # Parse output
-            return json.loads(stdout.decode())
+            return msgspec.json.decode(stdout)
             
         finally:
-            os.unlink(temp_file)
\ No newline at end of file
+            if temp_file:
+                os.unlink(temp_file)
\ No newline at end of file
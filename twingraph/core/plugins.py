@@ -5,13 +5,12 @@
 Plugin system for extending TwinGraph with custom executors and components.
 """
 
-import importlib
 import importlib.util
-from typing import Dict, Any, List, Optional, Type, Protocol, runtime_checkable
-from pathlib import Path
 import inspect
-import yaml
-import json
+import os
+from collections import defaultdict
+from typing import Callable, Dict, Any, List, Optional, Tuple, Type, Protocol, runtime_checkable
+from pathlib import Path
 from abc import ABC, abstractmethod
 
 from .logging import get_logger
@@ -22,7 +21,12 @@ logger = get_logger(__name__)
 
 @runtime_checkable
 class PluginInterface(Protocol):
-    """Protocol that all plugins must implement."""
+    """
+    Protocol that all plugins must implement.
+    
+    Loading checks plugins against _PLUGIN_METHODS and _PLUGIN_ATTRS with
+    plain attribute probes, which is cheaper than isinstance() here.
+    """
     
     name: str
     version: str
@@ -46,6 +50,10 @@ class PluginInterface(Protocol):
         ...
 
 
+_PLUGIN_METHODS = ('initialize', 'get_executors', 'get_components', 'cleanup')
+_PLUGIN_ATTRS = ('name', 'version', 'description', 'author') + _PLUGIN_METHODS
+
+
 class ExecutorPlugin(ABC):
     """Base class for custom executor plugins."""
     
@@ -80,7 +88,11 @@ class PluginManager:
         self._plugins: Dict[str, PluginInterface] = {}
         self._executors: Dict[str, ExecutorPlugin] = {}
         self._components: Dict[str, Any] = {}
-        self._hooks: Dict[str, List[callable]] = {
+        # Registered names per plugin, so unloading doesn't scan every entry
+        self._plugin_executors: Dict[str, List[str]] = defaultdict(list)
+        self._plugin_components: Dict[str, List[str]] = defaultdict(list)
+        # Hooks are stored with whether they are coroutine functions
+        self._hooks: Dict[str, List[Tuple[Callable, bool]]] = {
             'pre_execution': [],
             'post_execution': [],
             'on_error': [],
@@ -91,19 +103,21 @@ class PluginManager:
         """Discover available plugins in the plugin directory."""
         discovered = []
         
-        # Check for Python plugins
-        for path in self.plugin_dir.glob("*.py"):
-            if path.stem != "__init__":
-                discovered.append(path.stem)
-        
-        # Check for plugin packages
-        for path in self.plugin_dir.iterdir():
-            if path.is_dir() and (path / "__init__.py").exists():
-                discovered.append(path.name)
-        
-        # Check for plugin manifests
-        for path in self.plugin_dir.glob("*.yaml"):
-            discovered.append(path.stem)
+        # One directory pass; DirEntry caches the file type from readdir
+        with os.scandir(self.plugin_dir) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if entry.is_dir():
+                    # Plugin packages
+                    if os.path.exists(os.path.join(entry.path, "__init__.py")):
+                        discovered.append(entry.name)
+                elif ext == ".py":
+                    # Python plugins
+                    if stem != "__init__":
+                        discovered.append(stem)
+                elif ext in (".yaml", ".yml"):
+                    # Plugin manifests
+                    discovered.append(stem)
         
         logger.info(f"Discovered {len(discovered)} plugins: {discovered}")
         return discovered
@@ -127,7 +141,7 @@ class PluginManager:
             raise TwinGraphError(f"Could not load plugin: {plugin_name}")
         
         # Validate plugin interface
-        if not isinstance(plugin, PluginInterface):
+        if not all(hasattr(plugin, attr) for attr in _PLUGIN_ATTRS):
             raise TwinGraphError(
                 f"Plugin {plugin_name} does not implement PluginInterface"
             )
@@ -143,6 +157,7 @@ class PluginManager:
         for name, executor_class in executors.items():
             full_name = f"{plugin_name}.{name}"
             self._executors[full_name] = executor_class()
+            self._plugin_executors[plugin_name].append(full_name)
             logger.info(f"Registered executor: {full_name}")
         
         # Register components
@@ -150,10 +165,11 @@ class PluginManager:
         for name, component in components.items():
             full_name = f"{plugin_name}.{name}"
             self._components[full_name] = component
+            self._plugin_components[plugin_name].append(full_name)
             logger.info(f"Registered component: {full_name}")
             
             # Run hooks
-            for hook in self._hooks['on_component_register']:
+            for hook, _ in self._hooks['on_component_register']:
                 hook(full_name, component)
         
         logger.info(f"Successfully loaded plugin: {plugin_name}")
@@ -182,12 +198,19 @@ class PluginManager:
                 else:
                     return None
             
-            # Find plugin class
+            # Plugins name their class via PLUGIN_CLASS; load_plugin checks
+            # the interface on the instance
+            plugin_class = getattr(module, 'PLUGIN_CLASS', None)
+            if inspect.isclass(plugin_class):
+                return plugin_class()
+            
+            # Otherwise scan the module for a class with the plugin methods;
+            # data members may only be set by __init__
             for name, obj in inspect.getmembers(module):
                 if (
                     inspect.isclass(obj) and
-                    issubclass(obj, PluginInterface) and
-                    obj is not PluginInterface
+                    obj is not PluginInterface and
+                    all(hasattr(obj, method) for method in _PLUGIN_METHODS)
                 ):
                     return obj()
             
@@ -210,13 +233,17 @@ class PluginManager:
         if not manifest_path:
             return None
         
+        # Parsers are only needed once a manifest actually exists
+        import orjson
+        import yaml
+        
         try:
-            # Load manifest
-            with open(manifest_path) as f:
-                if manifest_path.suffix == '.json':
-                    manifest = json.load(f)
-                else:
-                    manifest = yaml.safe_load(f)
+            # Load manifest; LibYAML's loader when PyYAML was built with it
+            data = manifest_path.read_bytes()
+            if manifest_path.suffix == '.json':
+                manifest = orjson.loads(data)
+            else:
+                manifest = yaml.load(data, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
             
             # Create dynamic plugin class
             class ManifestPlugin:
@@ -333,20 +360,12 @@ class PluginManager:
         plugin.cleanup()
         
         # Remove executors
-        executors_to_remove = [
-            name for name in self._executors
-            if name.startswith(f"{plugin_name}.")
-        ]
-        for name in executors_to_remove:
-            del self._executors[name]
+        for name in self._plugin_executors.pop(plugin_name, ()):
+            self._executors.pop(name, None)
         
         # Remove components
-        components_to_remove = [
-            name for name in self._components
-            if name.startswith(f"{plugin_name}.")
-        ]
-        for name in components_to_remove:
-            del self._components[name]
+        for name in self._plugin_components.pop(plugin_name, ()):
+            self._components.pop(name, None)
         
         # Remove plugin
         del self._plugins[plugin_name]
@@ -372,15 +391,17 @@ class PluginManager:
     def register_hook(self, event: str, callback: callable) -> None:
         """Register a hook for plugin events."""
         if event in self._hooks:
-            self._hooks[event].append(callback)
+            self._hooks[event].append(
+                (callback, inspect.iscoroutinefunction(callback))
+            )
         else:
             logger.warning(f"Unknown hook event: {event}")
     
     async def execute_hooks(self, event: str, *args, **kwargs) -> None:
         """Execute all hooks for an event."""
-        for hook in self._hooks.get(event, []):
+        for hook, is_coroutine in self._hooks.get(event, []):
             try:
-                if inspect.iscoroutinefunction(hook):
+                if is_coroutine:
                     await hook(*args, **kwargs)
                 else:
                     hook(*args, **kwargs)
@@ -5,25 +5,27 @@
 OpenTelemetry instrumentation for distributed tracing and metrics.
 """
 
-from typing import Dict, Any, Optional, Callable, TypeVar
+from typing import Dict, Any, Iterable, List, Optional, Callable, Tuple, TypeVar
 import functools
+import inspect
+import os
+import threading
+import time
+from collections import defaultdict
 from contextlib import contextmanager
-from datetime import datetime
+from contextvars import ContextVar
 
 from opentelemetry import trace, metrics
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.trace import Status, StatusCode
 from opentelemetry.metrics import CallbackOptions, Observation
-import opentelemetry.instrumentation.redis
-import opentelemetry.instrumentation.celery
-import opentelemetry.instrumentation.fastapi
-import opentelemetry.instrumentation.httpx
 
 from .logging import get_logger
 
@@ -31,19 +33,166 @@ logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# Span batching defaults, tuned for bursty component traces: a larger queue
+# and shorter delay than the SDK's (2048 spans / 5 s) so bursts aren't
+# dropped, and smaller batches so each export stays well under gRPC's 4 MB
+# message limit. OTEL_BSP_* variables still override them.
+BSP_MAX_QUEUE_SIZE = 4096
+BSP_SCHEDULE_DELAY_MS = 1000
+BSP_MAX_EXPORT_BATCH_SIZE = 256
+BSP_REMOTE_EXPORT_BATCH_SIZE = 128
+BSP_EXPORT_TIMEOUT_MS = 10000
+
+_LOCAL_HOSTS = ('localhost', '127.0.0.1', '[::1]')
+
+# Libraries instrument_libraries() can patch, as named in
+# TWINGRAPH_OTEL_INSTRUMENT (e.g. "redis,httpx")
+INSTRUMENTABLE_LIBRARIES = ('redis', 'celery', 'fastapi', 'httpx')
+
+# Shared attributes for unlabelled custom metrics; never mutated
+_EMPTY_LABELS: Dict[str, str] = {}
+
+# Result types whose length is reported as result.size
+_SIZED_RESULTS = (list, tuple, dict, set, str, bytes)
+
+
+# Durations a workflow holds before its batch is recorded early
+_METRIC_BATCH_SIZE = 4096
+
+
+class _MetricBatch:
+    """
+    Component metrics held back until the enclosing workflow ends.
+    
+    Components may finish on other threads, or after the workflow exited
+    (tasks it started but didn't await); the add methods return False once
+    the batch is closed and the caller records the metric directly.
+    """
+    
+    __slots__ = ('executions', 'durations', 'errors', 'size', 'closed', 'lock')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.closed = False
+        self._reset()
+    
+    def _reset(self):
+        # Keyed by (component, type, error) like TelemetryManager._labels
+        self.executions: Dict[tuple, int] = defaultdict(int)
+        self.durations: Dict[tuple, List[float]] = defaultdict(list)
+        self.errors: Dict[tuple, int] = defaultdict(int)
+        self.size = 0
+    
+    def add_execution(self, key: tuple) -> bool:
+        with self.lock:
+            if self.closed:
+                return False
+            self.executions[key] += 1
+            return True
+    
+    def add_duration(self, key: tuple, duration: float) -> bool:
+        with self.lock:
+            if self.closed:
+                return False
+            self.durations[key].append(duration)
+            self.size += 1
+            return True
+    
+    def add_error(self, key: tuple) -> bool:
+        with self.lock:
+            if self.closed:
+                return False
+            self.errors[key] += 1
+            return True
+    
+    @property
+    def full(self) -> bool:
+        return self.size >= _METRIC_BATCH_SIZE
+    
+    def drain(
+        self,
+        close: bool = False
+    ) -> Tuple[Dict[tuple, int], Dict[tuple, List[float]], Dict[tuple, int]]:
+        """Take the batched metrics, leaving the batch empty."""
+        with self.lock:
+            drained = (self.executions, self.durations, self.errors)
+            self._reset()
+            self.closed = self.closed or close
+        return drained
+
+
+# Batch for the workflow traced in the current context, if any
+_metric_batch: ContextVar[Optional[_MetricBatch]] = ContextVar(
+    'twingraph_metric_batch', default=None
+)
+
+
+def _instrument_once(instrumentor: Any):
+    # Instrumentors are process-wide singletons; patching twice would wrap
+    # every call twice
+    if not instrumentor.is_instrumented_by_opentelemetry:
+        instrumentor.instrument()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
 
 class TelemetryManager:
-    """Manages OpenTelemetry instrumentation for TwinGraph."""
+    """
+    Manages OpenTelemetry instrumentation for TwinGraph.
+    
+    Every manager in a process shares the globally installed providers and
+    one exporter per OTLP endpoint, so extra managers (other services,
+    workers, tests) don't open extra connections to the same collector.
+    Batching options only apply when a new endpoint's processor is created.
+    """
+    
+    # Per-endpoint span processors (each owns its exporter) and metric
+    # exporters, shared process-wide
+    _span_processors: Dict[str, BatchSpanProcessor] = {}
+    _metric_exporters: Dict[str, OTLPMetricExporter] = {}
     
     def __init__(
         self,
         service_name: str = "twingraph",
         otlp_endpoint: Optional[str] = None,
-        enabled: bool = True
+        enabled: bool = True,
+        bsp_queue_size: Optional[int] = None,
+        bsp_schedule_delay_ms: Optional[int] = None,
+        bsp_batch_size: Optional[int] = None,
+        bsp_export_timeout_ms: Optional[int] = None
     ):
         self.service_name = service_name
         self.otlp_endpoint = otlp_endpoint or "localhost:4317"
         self.enabled = enabled
+        # Set when spans can never be recorded (no-op provider or an
+        # always-off sampler), letting span() skip the tracer entirely
+        self._tracing_off = False
+        # Metric attribute dicts shared by every call with the same labels
+        self._labels: Dict[tuple, Dict[str, str]] = {}
+        # Custom metric histograms by name
+        self._custom_metrics: Dict[str, Any] = {}
+        # Returns the task queue length for twingraph.queue.size; nothing
+        # is reported until one is set
+        self.queue_size_source: Optional[Callable[[], int]] = None
+        
+        # Span batching: explicit arguments, then OTEL_BSP_*, then our defaults
+        remote = not self.otlp_endpoint.split('://')[-1].startswith(_LOCAL_HOSTS)
+        self.bsp_queue_size = bsp_queue_size or _env_int(
+            'OTEL_BSP_MAX_QUEUE_SIZE', BSP_MAX_QUEUE_SIZE
+        )
+        self.bsp_schedule_delay_ms = bsp_schedule_delay_ms or _env_int(
+            'OTEL_BSP_SCHEDULE_DELAY', BSP_SCHEDULE_DELAY_MS
+        )
+        self.bsp_batch_size = bsp_batch_size or _env_int(
+            'OTEL_BSP_MAX_EXPORT_BATCH_SIZE',
+            BSP_REMOTE_EXPORT_BATCH_SIZE if remote else BSP_MAX_EXPORT_BATCH_SIZE
+        )
+        self.bsp_export_timeout_ms = bsp_export_timeout_ms or _env_int(
+            'OTEL_BSP_EXPORT_TIMEOUT', BSP_EXPORT_TIMEOUT_MS
+        )
         self._initialized = False
         
         if self.enabled:
@@ -64,53 +213,81 @@ class TelemetryManager:
         # Initialize metrics
         self._init_metrics(resource)
         
-        # Auto-instrument libraries
-        self._auto_instrument()
+        # Instrument only the libraries asked for
+        requested = os.environ.get('TWINGRAPH_OTEL_INSTRUMENT')
+        if requested:
+            names = {name.strip() for name in requested.split(',') if name.strip()}
+            unknown = names.difference(INSTRUMENTABLE_LIBRARIES)
+            if unknown:
+                raise ValueError(
+                    f"Unknown TWINGRAPH_OTEL_INSTRUMENT libraries: {sorted(unknown)}"
+                )
+            self.instrument_libraries(
+                **{library: library in names for library in INSTRUMENTABLE_LIBRARIES}
+            )
         
         self._initialized = True
         logger.info(f"OpenTelemetry initialized for {self.service_name}")
     
     def _init_tracing(self, resource: Resource):
         """Initialize tracing provider."""
-        # Create OTLP exporter
-        otlp_exporter = OTLPSpanExporter(
-            endpoint=self.otlp_endpoint,
-            insecure=True
-        )
-        
-        # Create tracer provider
-        provider = TracerProvider(resource=resource)
-        processor = BatchSpanProcessor(otlp_exporter)
-        provider.add_span_processor(processor)
+        # Reuse the global tracer provider once one is installed
+        provider = trace.get_tracer_provider()
+        if isinstance(provider, trace.ProxyTracerProvider):
+            provider = TracerProvider(resource=resource)
+            trace.set_tracer_provider(provider)
         
-        # Set global tracer provider
-        trace.set_tracer_provider(provider)
+        # Export to each endpoint through a single processor
+        if (
+            isinstance(provider, TracerProvider) and
+            self.otlp_endpoint not in self._span_processors
+        ):
+            otlp_exporter = OTLPSpanExporter(
+                endpoint=self.otlp_endpoint,
+                insecure=True
+            )
+            processor = BatchSpanProcessor(
+                otlp_exporter,
+                max_queue_size=self.bsp_queue_size,
+                schedule_delay_millis=self.bsp_schedule_delay_ms,
+                max_export_batch_size=self.bsp_batch_size,
+                export_timeout_millis=self.bsp_export_timeout_ms
+            )
+            provider.add_span_processor(processor)
+            self._span_processors[self.otlp_endpoint] = processor
         
-        # Get tracer
+        # Get tracer; the global provider may have been set elsewhere first
         self.tracer = trace.get_tracer(__name__)
+        active = trace.get_tracer_provider()
+        self._tracing_off = (
+            isinstance(active, trace.NoOpTracerProvider) or
+            getattr(active, 'sampler', None) is ALWAYS_OFF
+        )
     
     def _init_metrics(self, resource: Resource):
         """Initialize metrics provider."""
-        # Create OTLP exporter
-        otlp_exporter = OTLPMetricExporter(
-            endpoint=self.otlp_endpoint,
-            insecure=True
-        )
-        
-        # Create metric reader
-        reader = PeriodicExportingMetricReader(
-            exporter=otlp_exporter,
-            export_interval_millis=60000  # Export every minute
-        )
-        
-        # Create meter provider
-        provider = MeterProvider(
-            resource=resource,
-            metric_readers=[reader]
-        )
-        
-        # Set global meter provider
-        metrics.set_meter_provider(provider)
+        # Readers are fixed when a meter provider is built, so only the
+        # first manager installs one; the rest record through it
+        if not isinstance(metrics.get_meter_provider(), MeterProvider):
+            otlp_exporter = self._metric_exporters.get(self.otlp_endpoint)
+            if otlp_exporter is None:
+                otlp_exporter = OTLPMetricExporter(
+                    endpoint=self.otlp_endpoint,
+                    insecure=True
+                )
+                self._metric_exporters[self.otlp_endpoint] = otlp_exporter
+            
+            # Create metric reader
+            reader = PeriodicExportingMetricReader(
+                exporter=otlp_exporter,
+                export_interval_millis=60000  # Export every minute
+            )
+            
+            # Set global meter provider
+            metrics.set_meter_provider(MeterProvider(
+                resource=resource,
+                metric_readers=[reader]
+            ))
         
         # Get meter
         self.meter = metrics.get_meter(__name__)
@@ -149,6 +326,9 @@ class TelemetryManager:
         )
         
         # Queue size (for Celery)
+        self._queue_obs_attrs = {"queue": "default"}
+        self._queue_observations: List[Observation] = []
+        self._callback_lock = threading.Lock()
         self.meter.create_observable_gauge(
             name="twingraph.queue.size",
             callbacks=[self._get_queue_size],
@@ -156,25 +336,57 @@ class TelemetryManager:
             unit="1"
         )
     
-    def _get_queue_size(self, options: CallbackOptions) -> Observation:
+    def _get_queue_size(self, options: CallbackOptions) -> Iterable[Observation]:
         """Callback to get queue size."""
-        # This would query actual queue size
-        # Placeholder for demonstration
-        return Observation(42, {"queue": "default"})
+        # Callbacks must not re-enter; an overlapping collection reports
+        # the last reading instead of querying the queue again
+        if not self._callback_lock.acquire(blocking=False):
+            return self._queue_observations
+        try:
+            source = self.queue_size_source
+            if source is not None:
+                self._queue_observations = [Observation(source(), self._queue_obs_attrs)]
+            return self._queue_observations
+        finally:
+            self._callback_lock.release()
     
-    def _auto_instrument(self):
-        """Auto-instrument common libraries."""
+    def instrument_libraries(
+        self,
+        redis: bool = True,
+        celery: bool = True,
+        fastapi: bool = True,
+        httpx: bool = True
+    ):
+        """
+        Instrument client/server libraries.
+        
+        Each instrumentor patches the library for the life of the process
+        and adds cost to every call, so only instrument the libraries the
+        process actually uses. Instrumentors are imported on demand, and
+        libraries that are already instrumented are left alone.
+        """
+        if not self.enabled:
+            return
+        
         # Redis
-        opentelemetry.instrumentation.redis.RedisInstrumentor().instrument()
+        if redis:
+            from opentelemetry.instrumentation.redis import RedisInstrumentor
+            _instrument_once(RedisInstrumentor())
         
         # Celery
-        opentelemetry.instrumentation.celery.CeleryInstrumentor().instrument()
+        if celery:
+            from opentelemetry.instrumentation.celery import CeleryInstrumentor
+            _instrument_once(CeleryInstrumentor())
         
         # FastAPI
-        opentelemetry.instrumentation.fastapi.FastAPIInstrumentor().instrument()
+        if fastapi:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            _instrument_once(FastAPIInstrumentor())
         
         # HTTP client
-        opentelemetry.instrumentation.httpx.HTTPXClientInstrumentor().instrument()
+        if httpx:
+            from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+            _instrument_once(HTTPXClientInstrumentor())
     
     @contextmanager
     def span(
@@ -188,10 +400,15 @@ class TelemetryManager:
             yield None
             return
         
+        if self._tracing_off:
+            # Shared non-recording span; nothing is allocated or exported
+            yield trace.INVALID_SPAN
+            return
+        
         with self.tracer.start_as_current_span(
             name,
             kind=kind,
-            attributes=attributes or {}
+            attributes=attributes
         ) as span:
             try:
                 yield span
@@ -200,119 +417,126 @@ class TelemetryManager:
                 span.record_exception(e)
                 raise
     
+    def _metric_labels(
+        self,
+        component: str,
+        component_type: str,
+        error: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Interned metric attributes for a component (and error type)."""
+        key = (component, component_type, error)
+        labels = self._labels.get(key)
+        if labels is None:
+            labels = {"component": component, "type": component_type}
+            if error is not None:
+                labels["error"] = error
+            labels = self._labels.setdefault(key, labels)
+        return labels
+    
     def trace_component(
         self,
-        component_type: str = "generic"
+        component_type: str = "generic",
+        record_size: bool = True
     ) -> Callable[[Callable[..., T]], Callable[..., T]]:
-        """Decorator to trace component execution."""
+        """
+        Decorator to trace component execution.
+        
+        Async components add their result's length to the span as
+        result.size; hot components can turn that off with record_size=False.
+        Inside trace_workflow, the component's metrics are aggregated and
+        recorded when the workflow ends.
+        """
         def decorator(func: Callable[..., T]) -> Callable[..., T]:
-            @functools.wraps(func)
-            async def async_wrapper(*args, **kwargs) -> T:
-                if not self.enabled:
-                    return await func(*args, **kwargs)
-                
-                start_time = datetime.utcnow()
+            # Per-component constants, built once rather than per call
+            fname = func.__name__
+            span_name = f"component.{fname}"
+            span_attributes = {
+                "component.type": component_type,
+                "component.name": fname,
+                "component.module": func.__module__,
+            }
+            labels = self._metric_labels(fname, component_type)
+            label_key = (fname, component_type, None)
+            
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs) -> T:
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    
+                    start_time = time.perf_counter_ns()
+                    
+                    with self.span(span_name, attributes=span_attributes) as span:
+                        batch = _metric_batch.get()
+                        try:
+                            # Record execution
+                            if batch is None or not batch.add_execution(label_key):
+                                self.component_counter.add(1, labels)
+                            
+                            # Execute function
+                            result = await func(*args, **kwargs)
+                            
+                            # Record duration
+                            duration = (time.perf_counter_ns() - start_time) / 1e6
+                            self._record_duration(batch, label_key, labels, duration)
+                            
+                            # Add result info to span, only if it is kept
+                            if (
+                                record_size and
+                                isinstance(result, _SIZED_RESULTS) and
+                                span.is_recording()
+                            ):
+                                span.set_attribute("result.size", len(result))
+                            
+                            return result
+                            
+                        except Exception as e:
+                            # Record error
+                            self._record_error(batch, fname, component_type, e)
+                            raise
                 
-                with self.span(
-                    f"component.{func.__name__}",
-                    attributes={
-                        "component.type": component_type,
-                        "component.name": func.__name__,
-                        "component.module": func.__module__,
-                    }
-                ) as span:
-                    try:
-                        # Record execution
-                        self.component_counter.add(
-                            1,
-                            {"component": func.__name__, "type": component_type}
-                        )
-                        
-                        # Execute function
-                        result = await func(*args, **kwargs)
-                        
-                        # Record duration
-                        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-                        self.component_duration.record(
-                            duration,
-                            {"component": func.__name__, "type": component_type}
-                        )
-                        
-                        # Add result info to span
-                        if hasattr(result, '__len__'):
-                            span.set_attribute("result.size", len(result))
-                        
-                        return result
-                        
-                    except Exception as e:
-                        # Record error
-                        self.error_counter.add(
-                            1,
-                            {
-                                "component": func.__name__,
-                                "type": component_type,
-                                "error": type(e).__name__
-                            }
-                        )
-                        raise
+                return async_wrapper
             
             @functools.wraps(func)
             def sync_wrapper(*args, **kwargs) -> T:
                 if not self.enabled:
                     return func(*args, **kwargs)
                 
-                start_time = datetime.utcnow()
+                start_time = time.perf_counter_ns()
                 
-                with self.span(
-                    f"component.{func.__name__}",
-                    attributes={
-                        "component.type": component_type,
-                        "component.name": func.__name__,
-                        "component.module": func.__module__,
-                    }
-                ) as span:
+                with self.span(span_name, attributes=span_attributes) as span:
+                    batch = _metric_batch.get()
                     try:
                         # Record execution
-                        self.component_counter.add(
-                            1,
-                            {"component": func.__name__, "type": component_type}
-                        )
+                        if batch is None or not batch.add_execution(label_key):
+                            self.component_counter.add(1, labels)
                         
                         # Execute function
                         result = func(*args, **kwargs)
                         
                         # Record duration
-                        duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-                        self.component_duration.record(
-                            duration,
-                            {"component": func.__name__, "type": component_type}
-                        )
+                        duration = (time.perf_counter_ns() - start_time) / 1e6
+                        self._record_duration(batch, label_key, labels, duration)
                         
                         return result
                         
                     except Exception as e:
                         # Record error
-                        self.error_counter.add(
-                            1,
-                            {
-                                "component": func.__name__,
-                                "type": component_type,
-                                "error": type(e).__name__
-                            }
-                        )
+                        self._record_error(batch, fname, component_type, e)
                         raise
             
-            # Return appropriate wrapper
-            import inspect
-            if inspect.iscoroutinefunction(func):
-                return async_wrapper
-            else:
-                return sync_wrapper
+            return sync_wrapper
         
         return decorator
     
     def trace_workflow(self, workflow_id: str):
-        """Context manager for tracing entire workflow execution."""
+        """
+        Context manager for tracing entire workflow execution.
+        
+        Components traced inside it batch their metrics: counts are summed
+        and durations recorded in one pass when the workflow exits, so the
+        SDK sees them then rather than as each component finishes.
+        """
         @contextmanager
         def workflow_context():
             if not self.enabled:
@@ -321,23 +545,69 @@ class TelemetryManager:
             
             # Increment active workflows
             self.active_workflows.add(1, {"workflow_id": workflow_id})
+            batch = _MetricBatch()
+            token = _metric_batch.set(batch)
             
             with self.span(
                 f"workflow.{workflow_id}",
-                attributes={
-                    "workflow.id": workflow_id,
-                    "workflow.start_time": datetime.utcnow().isoformat()
-                },
+                # The span's own start time records when the workflow began
+                attributes={"workflow.id": workflow_id},
                 kind=trace.SpanKind.SERVER
             ) as span:
                 try:
                     yield span
                 finally:
+                    _metric_batch.reset(token)
+                    # Closing makes components still running record directly
+                    self._flush_metric_batch(batch, close=True)
                     # Decrement active workflows
                     self.active_workflows.add(-1, {"workflow_id": workflow_id})
         
         return workflow_context()
     
+    def _record_duration(
+        self,
+        batch: Optional[_MetricBatch],
+        key: tuple,
+        labels: Dict[str, str],
+        duration: float
+    ):
+        """Record a component duration, or add it to the workflow's batch."""
+        if batch is None or not batch.add_duration(key, duration):
+            self.component_duration.record(duration, labels)
+        elif batch.full:
+            # Long workflows don't hold an unbounded list of durations
+            self._flush_metric_batch(batch)
+    
+    def _record_error(
+        self,
+        batch: Optional[_MetricBatch],
+        fname: str,
+        component_type: str,
+        error: Exception
+    ):
+        """Count a component error, or add it to the workflow's batch."""
+        key = (fname, component_type, type(error).__name__)
+        if batch is None or not batch.add_error(key):
+            self.error_counter.add(1, self._metric_labels(*key))
+    
+    def _flush_metric_batch(self, batch: _MetricBatch, close: bool = False):
+        """Record a workflow's batched component metrics."""
+        executions, durations, errors = batch.drain(close)
+        
+        for key, count in executions.items():
+            self.component_counter.add(count, self._metric_labels(*key))
+        
+        # Each duration is still recorded so histogram buckets stay exact
+        record = self.component_duration.record
+        for key, values in durations.items():
+            labels = self._metric_labels(*key)
+            for duration in values:
+                record(duration, labels)
+        
+        for key, count in errors.items():
+            self.error_counter.add(count, self._metric_labels(*key))
+    
     def record_custom_metric(
         self,
         name: str,
@@ -350,37 +620,47 @@ class TelemetryManager:
             return
         
         # Create metric if it doesn't exist
-        if not hasattr(self, f"custom_{name}"):
-            metric = self.meter.create_histogram(
+        metric = self._custom_metrics.get(name)
+        if metric is None:
+            metric = self._custom_metrics.setdefault(name, self.meter.create_histogram(
                 name=f"twingraph.custom.{name}",
                 description=f"Custom metric: {name}",
                 unit=unit
-            )
-            setattr(self, f"custom_{name}", metric)
+            ))
         
         # Record value
-        metric = getattr(self, f"custom_{name}")
-        metric.record(value, labels or {})
+        metric.record(value, labels or _EMPTY_LABELS)
 
 
 # Global telemetry instance
 _telemetry_manager: Optional[TelemetryManager] = None
+_telemetry_lock = threading.Lock()
 
 
 def initialize_telemetry(
     service_name: str = "twingraph",
     otlp_endpoint: Optional[str] = None,
-    enabled: bool = True
+    enabled: bool = True,
+    **batch_options: int
 ) -> TelemetryManager:
-    """Initialize global telemetry manager."""
+    """
+    Initialize global telemetry manager.
+    
+    batch_options (bsp_queue_size, bsp_schedule_delay_ms, bsp_batch_size,
+    bsp_export_timeout_ms) tune the span BatchSpanProcessor.
+    """
     global _telemetry_manager
     
     if _telemetry_manager is None:
-        _telemetry_manager = TelemetryManager(
-            service_name=service_name,
-            otlp_endpoint=otlp_endpoint,
-            enabled=enabled
-        )
+        # Only one caller may build the manager; reads afterwards need no lock
+        with _telemetry_lock:
+            if _telemetry_manager is None:
+                _telemetry_manager = TelemetryManager(
+                    service_name=service_name,
+                    otlp_endpoint=otlp_endpoint,
+                    enabled=enabled,
+                    **batch_options
+                )
     
     return _telemetry_manager
 
@@ -393,9 +673,9 @@ def get_telemetry() -> TelemetryManager:
 
 
 # Convenience decorators
-def trace_component(component_type: str = "generic"):
+def trace_component(component_type: str = "generic", record_size: bool = True):
     """Decorator to trace component execution."""
-    return get_telemetry().trace_component(component_type)
+    return get_telemetry().trace_component(component_type, record_size)
 
 
 # Export main components
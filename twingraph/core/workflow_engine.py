@@ -2,8 +2,9 @@
 # Copyright (c) 2025 TwinGraph Contributors
 
 import asyncio
-from typing import Dict, Any, List, Optional
-from collections import namedtuple
+import io
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import json
 import inspect
 import ast
@@ -13,6 +14,20 @@ from ..orchestration.orchestration_tools import component, pipeline
 from .languages import LanguageExecutor, PythonExecutor, BashExecutor, JavaScriptExecutor
 from .plugins import get_plugin_manager
 
+# Fixed pieces of generated TwinGraph code
+CODE_HEADER = (
+    "from typing import NamedTuple\n"
+    "from collections import namedtuple\n"
+    "from twingraph import component, pipeline\n"
+    "\n"
+)
+PLACEHOLDER_BODY = (
+    "    # Component implementation\n"
+    "    outputs = namedtuple('outputs', ['result'])\n"
+    "    return outputs(None)\n"
+)
+HASH_SUFFIX = "['hash']"
+
 class WorkflowEngine:
     def __init__(self):
         self.executors: Dict[str, LanguageExecutor] = {
@@ -22,75 +37,127 @@ class WorkflowEngine:
         }
         self.execution_context: Dict[str, Any] = {}
         self.plugin_manager = get_plugin_manager()
+        # Executor for each language, built-ins first; filled by _load_plugins
+        self._lang_executors: Dict[str, LanguageExecutor] = {}
         
         # Auto-discover and load plugins
         self._load_plugins()
         
-    async def execute(self, workflow: Workflow, execution_id: str) -> Dict[str, Any]:
-        """Execute a workflow and return results"""
+    async def execute(
+        self,
+        workflow: Workflow,
+        execution_id: str,
+        cancel_event: Optional[asyncio.Event] = None
+    ) -> Dict[str, Any]:
+        """Execute a workflow and return results.
+        
+        Nodes at the same topological level run concurrently. If
+        cancel_event is set, execution stops before the next level with
+        asyncio.CancelledError.
+        """
         # Build execution graph
-        graph = self._build_execution_graph(workflow)
+        graph, inbound = self._build_execution_graph(workflow)
+        node_index = {node.id: node for node in workflow.nodes}
         
         # Initialize execution context
         self.execution_context[execution_id] = {
             'nodes': {},
             'results': {},
-            'status': 'running'
+            'status': 'running',
+            'node_index': node_index,
+            'inbound_edges': inbound
         }
         
-        # Execute nodes in topological order
-        execution_order = self._topological_sort(graph)
+        # Execute levels in topological order, each level's nodes together
+        levels = self._topological_levels(graph)
         
-        for node_id in execution_order:
-            node = self._get_node_by_id(workflow, node_id)
-            if node:
-                await self._execute_node(node, workflow, execution_id)
+        try:
+            for level in levels:
+                if cancel_event is not None and cancel_event.is_set():
+                    self.execution_context[execution_id]['status'] = 'cancelled'
+                    raise asyncio.CancelledError(f"Execution {execution_id} cancelled")
+                tasks = [
+                    asyncio.ensure_future(
+                        self._execute_node(node_index[node_id], workflow, execution_id)
+                    )
+                    for node_id in level
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    # Don't leave siblings of a failed node running
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+        except BaseException:
+            # Nodes that never started won't run
+            nodes = self.execution_context[execution_id]['nodes']
+            for level in levels:
+                for node_id in level:
+                    nodes.setdefault(node_id, {'status': 'skipped'})
+            raise
         
         return self.execution_context[execution_id]['results']
     
-    def _build_execution_graph(self, workflow: Workflow) -> Dict[str, List[str]]:
-        """Build adjacency list representation of workflow"""
+    def _build_execution_graph(self, workflow: Workflow) -> Tuple[Dict[str, List[str]], Dict[str, List[Edge]]]:
+        """
+        Build adjacency list representation of workflow, plus the inbound
+        edges of each target node
+        """
         graph = {node.id: [] for node in workflow.nodes}
+        inbound: Dict[str, List[Edge]] = {}
         
         for edge in workflow.edges:
             if edge.source in graph:
                 graph[edge.source].append(edge.target)
+            inbound.setdefault(edge.target, []).append(edge)
         
-        return graph
+        return graph, inbound
     
     def _topological_sort(self, graph: Dict[str, List[str]]) -> List[str]:
         """Perform topological sort on the workflow graph"""
-        visited = set()
-        stack = []
-        
-        def dfs(node: str):
-            visited.add(node)
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor)
-            stack.append(node)
-        
-        for node in graph:
-            if node not in visited:
-                dfs(node)
-        
-        return stack[::-1]
+        return [node for level in self._topological_levels(graph) for node in level]
     
-    def _get_node_by_id(self, workflow: Workflow, node_id: str) -> Optional[Node]:
-        """Get node by ID from workflow"""
-        for node in workflow.nodes:
-            if node.id == node_id:
-                return node
-        return None
+    def _topological_levels(self, graph: Dict[str, List[str]]) -> List[List[str]]:
+        """
+        Group nodes into levels (Kahn's algorithm): every node's
+        dependencies are in earlier levels, so a level's nodes are independent
+        """
+        in_degree = dict.fromkeys(graph, 0)
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                # Edges to unknown nodes can't block anything
+                if neighbor in in_degree:
+                    in_degree[neighbor] += 1
+        
+        level = [node for node, degree in in_degree.items() if degree == 0]
+        levels = []
+        placed = 0
+        while level:
+            levels.append(level)
+            placed += len(level)
+            next_level = []
+            for node in level:
+                for neighbor in graph[node]:
+                    if neighbor in in_degree:
+                        in_degree[neighbor] -= 1
+                        if in_degree[neighbor] == 0:
+                            next_level.append(neighbor)
+            level = next_level
+        
+        if placed != len(graph):
+            raise ValueError("Cycle detected in workflow graph")
+        return levels
     
     async def _execute_node(self, node: Node, workflow: Workflow, execution_id: str):
         """Execute a single node"""
         context = self.execution_context[execution_id]
         
-        # Update node status
-        context['nodes'][node.id] = {
+        # Update node status; times are time.monotonic() seconds
+        node_state = context['nodes'][node.id] = {
             'status': 'running',
-            'start_time': asyncio.get_event_loop().time()
+            'start_time': time.monotonic()
         }
         
         try:
@@ -112,22 +179,25 @@ class WorkflowEngine:
             context['nodes'][node.id]['status'] = 'failed'
             context['nodes'][node.id]['error'] = str(e)
             raise
+        
+        finally:
+            node_state['end_time'] = time.monotonic()
+            node_state['duration'] = node_state['end_time'] - node_state['start_time']
     
     def _gather_inputs(self, node: Node, workflow: Workflow, execution_id: str) -> Dict[str, Any]:
         """Gather inputs from connected nodes"""
         inputs = {}
         context = self.execution_context[execution_id]
         
-        # Find edges targeting this node
-        for edge in workflow.edges:
-            if edge.target == node.id:
-                source_result = context['results'].get(edge.source, {})
-                
-                # Map output to input based on handles
-                if edge.target_handle and edge.source_handle:
-                    inputs[edge.target_handle] = source_result.get(edge.source_handle)
-                else:
-                    inputs.update(source_result)
+        # Edges targeting this node
+        for edge in context['inbound_edges'].get(node.id, ()):
+            source_result = context['results'].get(edge.source, {})
+            
+            # Map output to input based on handles
+            if edge.target_handle and edge.source_handle:
+                inputs[edge.target_handle] = source_result.get(edge.source_handle)
+            else:
+                inputs.update(source_result)
         
         return inputs
     
@@ -136,62 +206,49 @@ class WorkflowEngine:
         language = node.data.language or 'python'
         code = node.data.code or ''
         
-        # Check built-in executors first
-        if language in self.executors:
-            executor = self.executors[language]
-        else:
-            # Check plugin executors
-            plugin_executor = None
-            for executor_name in self.plugin_manager.list_executors():
-                plugin_exec = self.plugin_manager.get_executor(executor_name)
-                if language in plugin_exec.get_supported_languages():
-                    plugin_executor = plugin_exec
-                    break
-            
-            if not plugin_executor:
+        executor = self._lang_executors.get(language)
+        if executor is None:
+            # A plugin may have been loaded since the index was built
+            self._index_executors()
+            executor = self._lang_executors.get(language)
+            if executor is None:
                 raise ValueError(f"Unsupported language: {language}")
-            
-            executor = plugin_executor
         
         # Prepare execution config
         config = {
             'timeout': node.data.config.timeout if node.data.config else 30,
             'environment': node.data.config.environment if node.data.config else {},
+            'node_id': node.id,
         }
         
         # Execute code
         result = await executor.execute(code, inputs, config)
         
-        # Convert to TwinGraph compatible format
+        # Copy so the node's outputs don't alias the executor's result
         if language == 'python':
-            # Wrap in namedtuple format expected by TwinGraph
-            outputs = namedtuple('outputs', list(result.keys()))
-            return outputs(**result)._asdict()
+            return dict(result)
         
         return result
     
     def generate_twingraph_code(self, workflow: Workflow) -> str:
         """Generate TwinGraph-compatible Python code from workflow"""
-        code_lines = [
-            "from typing import NamedTuple",
-            "from collections import namedtuple",
-            "from twingraph import component, pipeline",
-            "",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write(CODE_HEADER)
         
         # Generate component functions
         for node in workflow.nodes:
             if node.type == 'component':
-                code_lines.extend(self._generate_component_code(node))
-                code_lines.append("")
+                self._write_component_code(write, node)
+                write("\n")
         
         # Generate pipeline function
-        code_lines.extend(self._generate_pipeline_code(workflow))
+        self._write_pipeline_code(write, workflow)
         
-        return "\n".join(code_lines)
+        return buf.getvalue()
     
-    def _generate_component_code(self, node: Node) -> List[str]:
-        """Generate component function code"""
+    def _write_component_code(self, write: Callable[[str], Any], node: Node):
+        """Write component function code"""
         func_name = node.data.label.replace(" ", "_").lower()
         
         # Extract inputs from node data
@@ -202,66 +259,53 @@ class WorkflowEngine:
                 param += f" = {inp.default}"
             input_params.append(param)
         
-        lines = [
-            f"@component()",
-            f"def {func_name}({', '.join(input_params)}) -> NamedTuple:",
-        ]
+        write(f"@component()\ndef {func_name}({', '.join(input_params)}) -> NamedTuple:\n")
         
         # Add the actual code or a placeholder
         if node.data.code:
             # Indent the code properly
-            code_lines = node.data.code.split('\n')
-            for line in code_lines:
+            for line in node.data.code.split('\n'):
                 if line.strip():
-                    lines.append(f"    {line}")
+                    write(f"    {line}\n")
         else:
-            lines.extend([
-                "    # Component implementation",
-                "    outputs = namedtuple('outputs', ['result'])",
-                "    return outputs(None)"
-            ])
-        
-        return lines
+            write(PLACEHOLDER_BODY)
     
-    def _generate_pipeline_code(self, workflow: Workflow) -> List[str]:
-        """Generate pipeline function code"""
-        lines = [
-            "@pipeline()",
-            f"def {workflow.name.replace(' ', '_').lower()}():",
-        ]
+    def _write_pipeline_code(self, write: Callable[[str], Any], workflow: Workflow):
+        """Write pipeline function code"""
+        pipeline_name = workflow.name.replace(' ', '_').lower()
+        write(f"@pipeline()\ndef {pipeline_name}():\n")
         
         # Track node outputs for referencing
         node_vars = {}
         
         # Generate node instantiations in topological order
-        graph = self._build_execution_graph(workflow)
+        graph, inbound = self._build_execution_graph(workflow)
         execution_order = self._topological_sort(graph)
+        node_index = {node.id: node for node in workflow.nodes}
         
         for node_id in execution_order:
-            node = self._get_node_by_id(workflow, node_id)
+            node = node_index.get(node_id)
             if node and node.type == 'component':
                 var_name = f"node_{node_id.replace('-', '_')}"
                 node_vars[node_id] = var_name
                 
                 # Find parent nodes
-                parents = []
-                for edge in workflow.edges:
-                    if edge.target == node_id and edge.source in node_vars:
-                        parents.append(node_vars[edge.source])
+                parents = [
+                    node_vars[edge.source]
+                    for edge in inbound.get(node_id, ())
+                    if edge.source in node_vars
+                ]
                 
                 # Generate function call
                 func_name = node.data.label.replace(" ", "_").lower()
                 
                 if parents:
-                    parent_hash = f"[{', '.join(p + \"['hash']\" for p in parents)}]"
-                    lines.append(f"    {var_name} = {func_name}(parent_hash={parent_hash})")
+                    parent_hash = ", ".join(f"{p}{HASH_SUFFIX}" for p in parents)
+                    write(f"    {var_name} = {func_name}(parent_hash=[{parent_hash}])\n")
                 else:
-                    lines.append(f"    {var_name} = {func_name}()")
+                    write(f"    {var_name} = {func_name}()\n")
         
-        lines.append("")
-        lines.append(f"{workflow.name.replace(' ', '_').lower()}()")
-        
-        return lines
+        write(f"\n{pipeline_name}()")
     
     def _type_to_python(self, type_str: str) -> str:
         """Convert type string to Python type annotation"""
@@ -288,4 +332,18 @@ class WorkflowEngine:
                 except Exception as e:
                     print(f"Failed to load plugin {plugin_name}: {e}")
         except Exception as e:
-            print(f"Plugin discovery failed: {e}")
\ No newline at end of file
+            print(f"Plugin discovery failed: {e}")
+        
+        self._index_executors()
+    
+    def _index_executors(self):
+        """Map each language to its executor; the first plugin to claim one wins."""
+        lang_executors: Dict[str, LanguageExecutor] = {}
+        for executor_name in self.plugin_manager.list_executors():
+            plugin_exec = self.plugin_manager.get_executor(executor_name)
+            for language in plugin_exec.get_supported_languages():
+                lang_executors.setdefault(language, plugin_exec)
+        
+        # Built-in executors take precedence
+        lang_executors.update(self.executors)
+        self._lang_executors = lang_executors
\ No newline at end of file
@@ -2,9 +2,12 @@
 Enhanced graph management for TwinGraph.
 """
 
+import atexit
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from contextlib import contextmanager
 
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
@@ -16,6 +19,24 @@ from ..core.exceptions import GraphConnectionError, GraphOperationError
 
 logger = logging.getLogger(__name__)
 
+# Process-wide managers keyed by (endpoint, graph_type, pool_size)
+_shared_managers: Dict[Tuple[str, str, int], "GraphManager"] = {}
+_shared_managers_lock = threading.Lock()
+
+
+class _BatchBuffer(threading.local):
+    """
+    Writes buffered by GraphManager.batch() until flush(): (label,
+    properties) vertices and (from_hash, to_hash, label) edges.
+    
+    Per thread, since one shared manager serves every caller in the process.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.vertices: List[Tuple[str, Dict[str, Any]]] = []
+        self.edges: List[Tuple[str, str, str]] = []
+
 
 class GraphManager:
     """Manages connections and operations with the graph database."""
@@ -25,9 +46,11 @@ class GraphManager:
         self.endpoint = config.get('graph_endpoint', 'ws://localhost:8182')
         self.graph_type = config.get('graph_type', 'tinkergraph')
         self.connection_pool_size = config.get('connection_pool_size', 10)
+        self.batch_size = config.get('batch_size', 500)
         self._connection = None
         self._graph = None
         self._g = None
+        self._batch = _BatchBuffer()
     
     @property
     def g(self):
@@ -82,6 +105,73 @@ class GraphManager:
             tx.rollback()
             raise
     
+    @contextmanager
+    def batch(self):
+        """
+        Buffer component executions and write them in one traversal on exit.
+        
+        Only writes made on the calling thread are buffered. Nested batches
+        flush when the outermost one exits, and a buffer reaching batch_size
+        records is flushed early so long pipelines don't keep the graph empty
+        until they end. If the body raises, the buffer is still written on a
+        best-effort basis and the body's error propagates.
+        """
+        buffer = self._batch
+        buffer.depth += 1
+        try:
+            yield self
+        except BaseException:
+            buffer.depth -= 1
+            if buffer.depth == 0:
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.warning(f"Failed to flush graph batch after an error: {e}")
+            raise
+        buffer.depth -= 1
+        if buffer.depth == 0:
+            self.flush()
+    
+    def flush(self):
+        """Write this thread's buffered vertices and edges in a single round-trip."""
+        buffer = self._batch
+        vertices, buffer.vertices = buffer.vertices, []
+        edges, buffer.edges = buffer.edges, []
+        if not vertices and not edges:
+            return
+        
+        try:
+            traversal = self.g.inject(0)
+            aliases = {}
+            for i, (label, properties) in enumerate(vertices):
+                alias = f"v{i}"
+                traversal = self._with_properties(
+                    traversal.addV(label), properties
+                ).as_(alias)
+                if 'Hash' in properties:
+                    aliases[properties['Hash']] = alias
+            
+            # Endpoints outside this batch are looked up by hash; a missing
+            # one skips only its own edge
+            for from_hash, to_hash, label in edges:
+                source = aliases.get(from_hash)
+                target = aliases.get(to_hash)
+                traversal = traversal.sideEffect(
+                    (__.select(source) if source else __.V().has('Hash', from_hash))
+                    .addE(label)
+                    .to(target or __.V().has('Hash', to_hash))
+                )
+            
+            traversal.iterate()
+            
+            logger.debug(f"Flushed {len(vertices)} vertices and {len(edges)} edges")
+            
+        except Exception as e:
+            raise GraphOperationError(
+                f"Failed to flush {len(vertices)} buffered vertices",
+                cause=e
+            )
+    
     def clear_graph(self):
         """Clear all vertices and edges from the graph."""
         try:
@@ -95,8 +185,13 @@ class GraphManager:
         self,
         attributes: Dict[str, Any],
         parent_hashes: List[str]
-    ) -> str:
-        """Add component execution to graph."""
+    ) -> Optional[str]:
+        """
+        Add component execution to graph.
+        
+        Inside batch() the write is buffered and None is returned; otherwise
+        the new vertex ID is.
+        """
         try:
             # Ensure required attributes
             required = ['Name', 'ExecutionID', 'Hash']
@@ -104,6 +199,17 @@ class GraphManager:
             if missing:
                 raise ValueError(f"Missing required attributes: {missing}")
             
+            buffer = self._batch
+            if buffer.depth:
+                buffer.vertices.append(('Component', attributes))
+                buffer.edges.extend(
+                    (parent_hash, attributes['Hash'], 'DEPENDS_ON')
+                    for parent_hash in parent_hashes
+                )
+                if len(buffer.vertices) >= self.batch_size:
+                    self.flush()
+                return None
+            
             # Create vertex
             vertex_id = self._add_vertex('Component', attributes)
             
@@ -124,6 +230,15 @@ class GraphManager:
                 cause=e
             )
     
+    def add_components_batch(
+        self,
+        executions: Iterable[Tuple[Dict[str, Any], List[str]]]
+    ):
+        """Add several (attributes, parent_hashes) executions in one round-trip."""
+        with self.batch():
+            for attributes, parent_hashes in executions:
+                self.add_component_execution(attributes, parent_hashes)
+    
     def add_pipeline_node(self, attributes: Dict[str, Any]) -> str:
         """Add pipeline node to graph."""
         try:
@@ -144,22 +259,24 @@ class GraphManager:
     
     def _add_vertex(self, label: str, properties: Dict[str, Any]) -> str:
         """Add vertex with properties."""
-        # Build traversal
-        traversal = self.g.addV(label)
-        
-        for key, value in properties.items():
-            # Handle different value types
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            elif value is None:
-                continue
-            
-            traversal = traversal.property(key, value)
-        
         # Execute and get vertex ID
-        vertex = traversal.next()
+        vertex = self._with_properties(self.g.addV(label), properties).next()
         return str(vertex.id)
     
+    @staticmethod
+    def _with_properties(traversal, properties: Dict[str, Any]):
+        """
+        Set all properties with one property(Map) step (TinkerPop 3.6+)
+        rather than a step per key. Dicts and lists are stored as JSON and
+        None values are skipped.
+        """
+        values = {
+            key: json.dumps(value) if isinstance(value, (dict, list)) else value
+            for key, value in properties.items()
+            if value is not None
+        }
+        return traversal.property(values) if values else traversal
+    
     def _add_edge(self, from_hash: str, to_hash: str, label: str):
         """Add edge between vertices identified by hash."""
         self.g.V().has('Hash', from_hash).as_('from').V().has(
@@ -249,25 +366,37 @@ class GraphManager:
         
         return processed
     
+    def submit_async(self, traversal, callback: Optional[Callable] = None) -> Future:
+        """
+        Submit a traversal without waiting for it.
+        
+        Independent traversals submitted together run concurrently on the
+        connection pool (connection_pool_size). The future resolves to
+        callback(traversal) if given, else the traversal itself.
+        """
+        return traversal.promise(callback)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics."""
         try:
-            stats = {
-                'total_vertices': self.g.V().count().next(),
-                'total_edges': self.g.E().count().next(),
-                'components': self.g.V().hasLabel('Component').count().next(),
-                'pipelines': self.g.V().hasLabel('Pipeline').count().next(),
-                'platforms': {}
+            # The queries are independent: send them all, then wait, so
+            # the latency is the slowest query rather than the sum
+            queries = {
+                'total_vertices': self.g.V().count(),
+                'total_edges': self.g.E().count(),
+                'components': self.g.V().hasLabel('Component').count(),
+                'pipelines': self.g.V().hasLabel('Pipeline').count(),
+                # Platform distribution
+                'platforms': self.g.V().hasLabel('Component').groupCount().by(
+                    'Platform'
+                ),
+            }
+            futures = {
+                key: self.submit_async(traversal, lambda t: t.next())
+                for key, traversal in queries.items()
             }
             
-            # Get platform distribution
-            platforms = self.g.V().hasLabel('Component').groupCount().by(
-                'Platform'
-            ).next()
-            
-            stats['platforms'] = platforms
-            
-            return stats
+            return {key: future.result() for key, future in futures.items()}
             
         except Exception as e:
             logger.error(f"Failed to get graph statistics: {e}")
@@ -307,4 +436,27 @@ class GraphManager:
             
         except Exception as e:
             logger.error(f"Failed to search components: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+def get_shared_manager(config: Dict[str, Any]) -> GraphManager:
+    """
+    Get the process-wide GraphManager for a graph configuration.
+    
+    Components share one connection (and its pool) per endpoint instead of
+    opening a WebSocket per call; it is closed at interpreter exit.
+    """
+    key = (
+        config.get('graph_endpoint', 'ws://localhost:8182'),
+        config.get('graph_type', 'tinkergraph'),
+        config.get('connection_pool_size', 10)
+    )
+    manager = _shared_managers.get(key)
+    if manager is None:
+        with _shared_managers_lock:
+            manager = _shared_managers.get(key)
+            if manager is None:
+                manager = GraphManager(config)
+                atexit.register(manager.disconnect)
+                _shared_managers[key] = manager
+    return manager
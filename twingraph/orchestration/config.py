@@ -2,7 +2,9 @@
 Configuration classes for TwinGraph orchestration.
 """
 
+import inspect
 from dataclasses import dataclass, field
+from enum import Enum
 from typing import Any, Dict, Optional
 
 
@@ -14,6 +16,8 @@ class ComponentConfig:
     timeout: Optional[int] = None
     auto_retry: bool = True
     max_retries: int = 3
+    retry_backoff_base: float = 1.0  # seconds before the first retry
+    max_backoff: float = 30.0
     
     # Platform-specific configs
     kubernetes_config: Optional[Dict[str, Any]] = None
@@ -37,6 +41,29 @@ class ComponentConfig:
         return config
 
 
+class ComputePlatform(Enum):
+    """Supported compute platforms for component execution."""
+    LOCAL = "local"
+    DOCKER = "docker"
+    KUBERNETES = "kubernetes"
+    LAMBDA = "lambda"
+    BATCH = "batch"
+    SLURM = "slurm"
+    SSH = "ssh"
+
+
+@dataclass
+class ComponentMetadata:
+    """Metadata for a component function."""
+    name: str
+    signature: inspect.Signature
+    source_code: str
+    file_path: str
+    line_number: int
+    platform: ComputePlatform
+    config: ComponentConfig
+
+
 @dataclass
 class PipelineConfig:
     """Configuration for pipeline execution."""
@@ -12,12 +12,10 @@ from typing import (
 from functools import wraps
 import inspect
 import logging
-from dataclasses import dataclass
-from enum import Enum
 
-from .executor import ComponentExecutor, PipelineExecutor
-from .config import ComponentConfig, PipelineConfig
-from ..graph.graph_tools import GraphManager
+from .executor import ComponentExecutor, PipelineExecutor, gather_branches
+from .config import ComponentConfig, ComponentMetadata, ComputePlatform, PipelineConfig
+from ..graph.graph_manager import get_shared_manager
 from ..core.exceptions import TwinGraphError
 
 logger = logging.getLogger(__name__)
@@ -25,29 +23,6 @@ logger = logging.getLogger(__name__)
 F = TypeVar('F', bound=Callable[..., Any])
 
 
-class ComputePlatform(Enum):
-    """Supported compute platforms for component execution."""
-    LOCAL = "local"
-    DOCKER = "docker"
-    KUBERNETES = "kubernetes"
-    LAMBDA = "lambda"
-    BATCH = "batch"
-    SLURM = "slurm"
-    SSH = "ssh"
-
-
-@dataclass
-class ComponentMetadata:
-    """Metadata for a component function."""
-    name: str
-    signature: inspect.Signature
-    source_code: str
-    file_path: str
-    line_number: int
-    platform: ComputePlatform
-    config: ComponentConfig
-
-
 def component(
     *,
     platform: Union[str, ComputePlatform] = ComputePlatform.LOCAL,
@@ -70,7 +45,8 @@ def component(
         platform: Compute platform to execute on
         docker_image: Docker image to use (if applicable)
         config: Platform-specific configuration
-        graph_config: Graph database configuration
+        graph_config: Graph database configuration (graph_endpoint,
+            graph_type, connection_pool_size)
         additional_attributes: Extra attributes to store in graph
         git_tracking: Whether to track git history
         auto_retry: Enable automatic retry on failure
@@ -112,18 +88,25 @@ def component(
             )
         )
         
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            executor = ComponentExecutor(
+        def make_executor() -> ComponentExecutor:
+            return ComponentExecutor(
                 metadata=metadata,
                 graph_config=graph_config or {},
                 additional_attributes=additional_attributes or {},
-                git_tracking=git_tracking
+                git_tracking=git_tracking,
+                # One graph connection per endpoint, not per call
+                graph_manager=get_shared_manager(graph_config or {})
             )
-            
-            return executor.execute(func, args, kwargs)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return make_executor().execute(func, args, kwargs)
+        
+        async def execute_async(*args, **kwargs):
+            return await make_executor().execute_async(func, args, kwargs)
         
         # Attach metadata for introspection
+        wrapper.execute_async = execute_async
         wrapper._twingraph_metadata = metadata
         wrapper._is_twingraph_component = True
         
@@ -168,6 +151,19 @@ def pipeline(
             model = train_model(processed)
             results = evaluate(model, processed)
             return results
+        
+        # Independent branches run concurrently in an async pipeline,
+        # at most max_parallel_tasks at a time
+        @pipeline()
+        async def branched_pipeline(data):
+            stats, features = await gather_branches(
+                lambda: compute_stats(data),
+                lambda: extract_features(data)
+            )
+            return stats, features
+    
+    An async pipeline runs to completion when called outside an event loop;
+    inside a running loop it returns an awaitable.
     """
     def decorator(func: F) -> F:
         pipeline_name = name or func.__name__
@@ -186,7 +182,8 @@ def pipeline(
             executor = PipelineExecutor(
                 config=config,
                 graph_config=graph_config or {},
-                clear_graph=clear_graph
+                clear_graph=clear_graph,
+                graph_manager=get_shared_manager(graph_config or {})
             )
             
             return executor.execute(func, args, kwargs)
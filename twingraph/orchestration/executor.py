@@ -3,20 +3,24 @@ Execution engines for TwinGraph components and pipelines.
 """
 
 import asyncio
+import functools
 import hashlib
+import inspect
 import json
+import os
+import random
 import time
 import traceback
 from collections import namedtuple
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import logging
 
-from ..graph.graph_tools import GraphManager
+from ..graph.graph_manager import GraphManager
 from ..core.exceptions import ComponentExecutionError, PipelineExecutionError
 from ..core.logging import get_logger, global_monitor, monitor_performance
-from .config import ComponentConfig, PipelineConfig
-from .decorators import ComponentMetadata, ComputePlatform
+from .config import ComponentConfig, ComponentMetadata, ComputePlatform, PipelineConfig
 from .platforms import (
     DockerExecutor, KubernetesExecutor, LambdaExecutor, 
     BatchExecutor, LocalExecutor, SlurmExecutor, SSHExecutor
@@ -25,6 +29,29 @@ from .platforms import (
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_git_attributes(repo_root: str) -> Dict[str, Any]:
+    """Read git metadata for the repository containing repo_root.
+    
+    The commit does not change during a pipeline run, so the result is
+    cached; PipelineExecutor clears it at the start of every run. Failures
+    (no repository, detached HEAD) are cached too, as an empty dict.
+    """
+    try:
+        import git
+        repo = git.Repo(repo_root, search_parent_directories=True)
+        
+        return {
+            'GitCommit': repo.head.commit.hexsha,
+            'GitBranch': repo.active_branch.name,
+            'GitAuthor': str(repo.head.commit.author),
+            'GitMessage': repo.head.commit.message.strip()
+        }
+    except Exception as e:
+        logger.warning(f"Failed to get git attributes: {e}")
+        return {}
+
+
 class ComponentExecutor:
     """Executes individual components with platform abstraction."""
     
@@ -33,13 +60,14 @@ class ComponentExecutor:
         metadata: ComponentMetadata,
         graph_config: Dict[str, Any],
         additional_attributes: Dict[str, Any],
-        git_tracking: bool
+        git_tracking: bool,
+        graph_manager: Optional[GraphManager] = None
     ):
         self.metadata = metadata
         self.graph_config = graph_config
         self.additional_attributes = additional_attributes
         self.git_tracking = git_tracking
-        self.graph_manager = GraphManager(graph_config)
+        self.graph_manager = graph_manager or GraphManager(graph_config)
         
         # Initialize platform executor
         self.platform_executor = self._get_platform_executor()
@@ -70,92 +98,146 @@ class ComponentExecutor:
     ) -> Dict[str, Any]:
         """Execute the component function."""
         start_time = time.time()
-        execution_id = self._generate_execution_id()
+        context, kwargs = self._prepare_context(args, kwargs)
         
+        try:
+            # Execute with retry logic
+            result = self._execute_with_retry(func, args, kwargs, context)
+            return self._handle_success(context, result, start_time)
+        except Exception as e:
+            raise self._handle_failure(context, e, start_time) from e
+    
+    async def execute_async(
+        self,
+        func: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute the component without blocking the event loop.
+        
+        Local functions and blocking platform executors run in a worker
+        thread, so independent components awaited together with
+        asyncio.gather overlap instead of running back to back. Retries
+        back off with asyncio.sleep rather than holding a thread.
+        """
+        start_time = time.time()
+        context, kwargs = self._prepare_context(args, kwargs)
+        
+        try:
+            result = await self._execute_with_retry_async(
+                func, args, kwargs, context
+            )
+            return await asyncio.to_thread(
+                self._handle_success, context, result, start_time
+            )
+        except Exception as e:
+            error = await asyncio.to_thread(
+                self._handle_failure, context, e, start_time
+            )
+            raise error from e
+    
+    def _prepare_context(
+        self,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the execution context and strip parent hashes from kwargs."""
         # Extract parent hashes
         parent_hashes = self._extract_parent_hashes(kwargs)
         kwargs = {k: v for k, v in kwargs.items() if k != 'parent_hash'}
         
         # Prepare execution context
         context = {
-            'execution_id': execution_id,
+            'execution_id': self._generate_execution_id(),
             'component_name': self.metadata.name,
             'start_time': datetime.utcnow().isoformat(),
             'inputs': self._serialize_inputs(args, kwargs),
             'parent_hashes': parent_hashes
         }
+        return context, kwargs
+    
+    def _handle_success(
+        self,
+        context: Dict[str, Any],
+        result: Any,
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Record, log and return a successful execution."""
+        execution_id = context['execution_id']
         
-        try:
-            # Execute with retry logic
-            result = self._execute_with_retry(func, args, kwargs, context)
-            
-            # Process results
-            execution_time = time.time() - start_time
-            processed_result = self._process_result(result, execution_id)
-            
-            # Record in graph
-            self._record_execution(
-                context, processed_result, execution_time, success=True
-            )
-            
-            # Log execution
-            logger.log_execution(
-                component=self.metadata.name,
-                execution_id=execution_id,
-                status='success',
-                duration=execution_time,
-                metadata={
-                    'platform': self.metadata.platform.value,
-                    'inputs': context['inputs']
-                }
-            )
-            
-            # Record metrics
-            global_monitor.record_execution(
-                component=self.metadata.name,
-                platform=self.metadata.platform.value,
-                duration=execution_time,
-                success=True
-            )
-            
-            return processed_result
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            error_info = {
-                'error_type': type(e).__name__,
-                'error_message': str(e),
-                'traceback': traceback.format_exc()
+        # Process results
+        execution_time = time.time() - start_time
+        processed_result = self._process_result(result, execution_id)
+        
+        # Record in graph
+        self._record_execution(
+            context, processed_result, execution_time, success=True
+        )
+        
+        # Log execution
+        logger.log_execution(
+            component=self.metadata.name,
+            execution_id=execution_id,
+            status='success',
+            duration=execution_time,
+            metadata={
+                'platform': self.metadata.platform.value,
+                'inputs': context['inputs']
             }
-            
-            # Record failure in graph
-            self._record_execution(
-                context, error_info, execution_time, success=False
-            )
-            
-            # Log error
-            logger.log_error(
-                component=self.metadata.name,
-                error=e,
-                execution_id=execution_id,
-                metadata={
-                    'platform': self.metadata.platform.value,
-                    'duration': execution_time
-                }
-            )
-            
-            # Record metrics
-            global_monitor.record_execution(
-                component=self.metadata.name,
-                platform=self.metadata.platform.value,
-                duration=execution_time,
-                success=False,
-                error_type=type(e).__name__
-            )
-            
-            raise ComponentExecutionError(
-                f"Component {self.metadata.name} failed: {str(e)}"
-            ) from e
+        )
+        
+        # Record metrics
+        global_monitor.record_execution(
+            component=self.metadata.name,
+            platform=self.metadata.platform.value,
+            duration=execution_time,
+            success=True
+        )
+        
+        return processed_result
+    
+    def _handle_failure(
+        self,
+        context: Dict[str, Any],
+        error: Exception,
+        start_time: float
+    ) -> ComponentExecutionError:
+        """Record and log a failed execution, returning the error to raise."""
+        execution_time = time.time() - start_time
+        error_info = {
+            'error_type': type(error).__name__,
+            'error_message': str(error),
+            'traceback': ''.join(traceback.format_exception(error))
+        }
+        
+        # Record failure in graph
+        self._record_execution(
+            context, error_info, execution_time, success=False
+        )
+        
+        # Log error
+        logger.log_error(
+            component=self.metadata.name,
+            error=error,
+            execution_id=context['execution_id'],
+            metadata={
+                'platform': self.metadata.platform.value,
+                'duration': execution_time
+            }
+        )
+        
+        # Record metrics
+        global_monitor.record_execution(
+            component=self.metadata.name,
+            platform=self.metadata.platform.value,
+            duration=execution_time,
+            success=False,
+            error_type=type(error).__name__
+        )
+        
+        return ComponentExecutionError(
+            f"Component {self.metadata.name} failed: {str(error)}"
+        )
     
     def _execute_with_retry(
         self, 
@@ -169,31 +251,66 @@ class ComponentExecutor:
         
         for attempt in range(config.max_retries if config.auto_retry else 1):
             try:
-                if self.metadata.platform == ComputePlatform.LOCAL:
-                    # Direct execution for local
-                    return func(*args, **kwargs)
-                else:
-                    # Platform-specific execution
-                    return self.platform_executor.execute(
-                        func, args, kwargs, context
-                    )
+                return self._run_attempt(func, args, kwargs, context)
             except Exception as e:
                 if not config.auto_retry or attempt == config.max_retries - 1:
                     raise
                 
-                wait_time = min(2 ** attempt, 30)  # Exponential backoff
-                logger.logger.warning(
-                    f"Attempt {attempt + 1} failed for {self.metadata.name}, "
-                    f"retrying in {wait_time}s: {str(e)}",
-                    extra={
-                        'component': self.metadata.name,
-                        'attempt': attempt + 1,
-                        'max_attempts': config.max_retries,
-                        'wait_time': wait_time,
-                        'error': str(e)
-                    }
+                time.sleep(self._retry_delay(attempt, e))
+    
+    async def _execute_with_retry_async(
+        self,
+        func: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Any:
+        """Execute function with retry logic without blocking the loop."""
+        config = self.metadata.config
+        
+        for attempt in range(config.max_retries if config.auto_retry else 1):
+            try:
+                return await asyncio.to_thread(
+                    self._run_attempt, func, args, kwargs, context
                 )
-                time.sleep(wait_time)
+            except Exception as e:
+                if not config.auto_retry or attempt == config.max_retries - 1:
+                    raise
+                
+                await asyncio.sleep(self._retry_delay(attempt, e))
+    
+    def _run_attempt(
+        self,
+        func: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Any:
+        """Run a single execution attempt."""
+        if self.metadata.platform == ComputePlatform.LOCAL:
+            # Direct execution for local
+            return func(*args, **kwargs)
+        # Platform-specific execution
+        return self.platform_executor.execute(func, args, kwargs, context)
+    
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Compute a jittered exponential backoff and log the retry."""
+        config = self.metadata.config
+        
+        backoff = min(config.max_backoff, config.retry_backoff_base * 2 ** attempt)
+        wait_time = backoff * (0.5 + random.random())
+        logger.logger.warning(
+            f"Attempt {attempt + 1} failed for {self.metadata.name}, "
+            f"retrying in {wait_time:.2f}s: {str(error)}",
+            extra={
+                'component': self.metadata.name,
+                'attempt': attempt + 1,
+                'max_attempts': config.max_retries,
+                'wait_time': wait_time,
+                'error': str(error)
+            }
+        )
+        return wait_time
     
     def _generate_execution_id(self) -> str:
         """Generate unique execution ID."""
@@ -288,19 +405,38 @@ class ComponentExecutor:
     
     def _get_git_attributes(self) -> Dict[str, Any]:
         """Get git-related attributes."""
-        try:
-            import git
-            repo = git.Repo(search_parent_directories=True)
-            
-            return {
-                'GitCommit': repo.head.commit.hexsha,
-                'GitBranch': repo.active_branch.name,
-                'GitAuthor': str(repo.head.commit.author),
-                'GitMessage': repo.head.commit.message.strip()
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get git attributes: {e}")
-            return {}
+        # Copy so callers cannot mutate the cached entry
+        return dict(_cached_git_attributes(os.getcwd()))
+
+
+# Config of the async pipeline running in the current context
+_active_pipeline: ContextVar[Optional[PipelineConfig]] = ContextVar(
+    'twingraph_active_pipeline', default=None
+)
+
+
+async def gather_branches(*branches: Callable[[], Any]) -> List[Any]:
+    """Run independent pipeline branches concurrently.
+    
+    Call from an async @pipeline body. Each branch is a zero-argument
+    callable (sync or async). Inside a pipeline, branches run at most
+    ``max_parallel_tasks`` at a time, or one after another when
+    ``parallel_execution`` is disabled. Results keep the branch order.
+    """
+    config = _active_pipeline.get()
+    if config is None:
+        limit = len(branches)
+    else:
+        limit = config.max_parallel_tasks if config.parallel_execution else 1
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run_branch(branch: Callable[[], Any]) -> Any:
+        async with semaphore:
+            if inspect.iscoroutinefunction(branch):
+                return await branch()
+            return await asyncio.to_thread(branch)
+    
+    return await asyncio.gather(*(run_branch(b) for b in branches))
 
 
 class PipelineExecutor:
@@ -310,12 +446,13 @@ class PipelineExecutor:
         self,
         config: PipelineConfig,
         graph_config: Dict[str, Any],
-        clear_graph: bool
+        clear_graph: bool,
+        graph_manager: Optional[GraphManager] = None
     ):
         self.config = config
         self.graph_config = graph_config
         self.clear_graph = clear_graph
-        self.graph_manager = GraphManager(graph_config)
+        self.graph_manager = graph_manager or GraphManager(graph_config)
         
         # Initialize Celery if enabled
         if config.celery_enabled:
@@ -327,17 +464,22 @@ class PipelineExecutor:
         args: Tuple[Any, ...], 
         kwargs: Dict[str, Any]
     ) -> Any:
-        """Execute the pipeline function."""
-        if self.clear_graph:
-            self.graph_manager.clear_graph()
+        """Execute the pipeline function.
         
-        start_time = time.time()
-        pipeline_id = self._generate_pipeline_id()
+        Async pipelines run to completion when no event loop is running;
+        inside a running loop (FastAPI, Jupyter) an awaitable is returned.
+        """
+        if inspect.iscoroutinefunction(func) and not self.config.celery_enabled:
+            run = self._execute_async(func, args, kwargs)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(run)
+            return run
+        
+        pipeline_id, start_time = self._start()
         
         try:
-            # Record pipeline start
-            self._record_pipeline_start(pipeline_id)
-            
             if self.config.celery_enabled:
                 # Distributed execution
                 result = self._execute_distributed(func, args, kwargs, pipeline_id)
@@ -352,13 +494,67 @@ class PipelineExecutor:
             return result
             
         except Exception as e:
+            raise self._failed(pipeline_id, start_time, e) from e
+    
+    async def _execute_async(
+        self,
+        func: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Execute an async pipeline function locally."""
+        pipeline_id, start_time = self._start()
+        
+        try:
+            with self._monitoring_context(self._local_context(pipeline_id)):
+                token = _active_pipeline.set(self.config)
+                try:
+                    result = await func(*args, **kwargs)
+                finally:
+                    _active_pipeline.reset(token)
+            
+            # Record pipeline completion
             execution_time = time.time() - start_time
-            self._record_pipeline_completion(
-                pipeline_id, execution_time, False, str(e)
-            )
-            raise PipelineExecutionError(
-                f"Pipeline {self.config.name} failed: {str(e)}"
-            ) from e
+            self._record_pipeline_completion(pipeline_id, execution_time, True)
+            
+            return result
+            
+        except Exception as e:
+            raise self._failed(pipeline_id, start_time, e) from e
+    
+    def _start(self) -> Tuple[str, float]:
+        """Prepare the graph and record the pipeline start."""
+        if self.clear_graph:
+            self.graph_manager.clear_graph()
+        
+        # Pick up commits made since the previous run
+        _cached_git_attributes.cache_clear()
+        
+        start_time = time.time()
+        pipeline_id = self._generate_pipeline_id()
+        
+        try:
+            # Record pipeline start
+            self._record_pipeline_start(pipeline_id)
+        except Exception as e:
+            raise self._failed(pipeline_id, start_time, e) from e
+        
+        return pipeline_id, start_time
+    
+    def _failed(
+        self,
+        pipeline_id: str,
+        start_time: float,
+        error: Exception
+    ) -> PipelineExecutionError:
+        """Record a failed run and build the error to raise."""
+        execution_time = time.time() - start_time
+        self._record_pipeline_completion(
+            pipeline_id, execution_time, False, str(error)
+        )
+        return PipelineExecutionError(
+            f"Pipeline {self.config.name} failed: {str(error)}"
+        )
     
     def _initialize_celery(self):
         """Initialize Celery for distributed execution."""
@@ -373,16 +569,20 @@ class PipelineExecutor:
         pipeline_id: str
     ) -> Any:
         """Execute pipeline locally."""
-        # Set up execution context
-        context = {
+        # Component records are written in batched round-trips, the last
+        # when the body returns or raises. Async pipelines aren't batched: branches run on other
+        # threads and could reference parents still in this thread's buffer.
+        with self._monitoring_context(self._local_context(pipeline_id)), \
+                self.graph_manager.batch():
+            return func(*args, **kwargs)
+    
+    def _local_context(self, pipeline_id: str) -> Dict[str, Any]:
+        """Set up execution context."""
+        return {
             'pipeline_id': pipeline_id,
             'pipeline_name': self.config.name,
             'monitoring_enabled': self.config.monitoring_enabled
         }
-        
-        # Execute the pipeline function
-        with self._monitoring_context(context):
-            return func(*args, **kwargs)
     
     def _execute_distributed(
         self,
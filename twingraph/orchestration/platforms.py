@@ -3,13 +3,15 @@ Platform-specific executors for TwinGraph components.
 """
 
 import json
+import math
 import os
 import subprocess
 import tempfile
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import docker
 import logging
+import orjson
 
 from ..core.exceptions import PlatformExecutionError
 from .config import ComponentConfig
@@ -36,17 +38,49 @@ class PlatformExecutor(ABC):
     
     def serialize_inputs(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
         """Serialize inputs for cross-platform execution."""
-        return json.dumps({
+        inputs = {
             'args': list(args),
             'kwargs': kwargs
-        })
+        }
+        if _has_non_finite(inputs):
+            # orjson writes NaN/Infinity as null; json keeps them
+            return json.dumps(inputs, default=_json_default)
+        try:
+            data = orjson.dumps(
+                inputs, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson rejects integers beyond 64 bits
+            return json.dumps(inputs, default=_json_default)
+        return data.decode()
     
-    def deserialize_output(self, output: str) -> Any:
-        """Deserialize output from platform execution."""
+    def deserialize_output(self, output: Union[str, bytes]) -> Any:
+        """Deserialize output from platform execution (bytes need no decode)."""
         try:
-            return json.loads(output)
-        except json.JSONDecodeError:
-            return output
+            return orjson.loads(output)
+        except orjson.JSONDecodeError:
+            return output.decode() if isinstance(output, bytes) else output
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether obj holds a NaN or infinite float, in containers or numpy arrays."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(item) for item in obj)
+    if getattr(getattr(obj, 'dtype', None), 'kind', None) in ('f', 'c'):
+        import numpy as np
+        return not np.isfinite(obj).all()
+    return False
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for numpy arrays and scalars."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class LocalExecutor(PlatformExecutor):
@@ -104,8 +138,7 @@ class DockerExecutor(PlatformExecutor):
             )
             
             # Parse output
-            output = container.decode('utf-8')
-            return self.deserialize_output(output)
+            return self.deserialize_output(container)
             
         except docker.errors.ContainerError as e:
             raise PlatformExecutionError(
@@ -445,7 +478,7 @@ class LambdaExecutor(PlatformExecutor):
             )
             
             # Parse response
-            result = json.loads(response['Payload'].read())
+            result = orjson.loads(response['Payload'].read())
             
             if 'errorMessage' in result:
                 raise PlatformExecutionError(